@@ -0,0 +1,316 @@
+# Pruned and Parallel Backtracking
+#
+# lc_patterns.generate_subsets is the classic backtracking shape - choose,
+# recurse, move on - but it has nowhere to say "this branch can't work", so
+# every search built from it visits the full tree. The framework here asks the
+# problem for three hooks and prunes with them:
+#
+#   choices(state)   -> the options to try next
+#   feasible(state)  -> False if the partial state already breaks a constraint
+#   promising(state) -> False if the best this branch could do can't matter (bound)
+#
+# It ships bitmask solvers for the usual suspects (permutations, combinations,
+# N-Queens, subset sum), where "which columns/items are used" is one int rather
+# than a set or a copied list.
+#
+# parallel_search() expands the top few levels of the tree into independent
+# work units and farms them out to a process pool. In first-solution mode the
+# first worker to succeed sets a shared event, and the others notice within a
+# few thousand nodes and stop.
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# 1. The Problem Interface
+class Problem:
+    """
+    Subclass and fill in the hooks. States should be immutable (tuples, ints)
+    so they can be shared between branches and pickled to workers.
+    """
+    def root(self):
+        raise NotImplementedError
+
+    def choices(self, state):
+        raise NotImplementedError
+
+    def extend(self, state, choice):
+        raise NotImplementedError
+
+    def is_complete(self, state):
+        raise NotImplementedError
+
+    def feasible(self, state):
+        return True
+
+    def promising(self, state):
+        return True
+
+    def solution(self, state):
+        return state
+
+# 2. Sequential Search
+def search(problem, start=None, first=False, stop_event=None, check_every=4096):
+    """
+    Yields solutions depth-first. Uses an explicit stack, so deep trees do not
+    hit the recursion limit. Stops early when stop_event (if given) is set.
+    """
+    stack = [problem.root() if start is None else start]
+    visited = 0
+    while stack:
+        state = stack.pop()
+        visited += 1
+        if stop_event is not None and visited % check_every == 0 and stop_event.is_set():
+            return
+        if problem.is_complete(state):
+            yield problem.solution(state)
+            if first:
+                return
+            continue
+        children = []
+        for choice in problem.choices(state):
+            child = problem.extend(state, choice)
+            if problem.feasible(child) and problem.promising(child):
+                children.append(child)
+        # Reversed so the first choice is explored first, as in recursion.
+        stack.extend(reversed(children))
+
+def solve(problem, first=False):
+    """
+    All solutions as a list, or the first solution (None if there is none).
+    """
+    if first:
+        return next(search(problem, first=True), None)
+    return list(search(problem))
+
+# 3. Parallel Search
+def split_work(problem, depth):
+    """
+    Expands the tree breadth-first to the given depth. Returns (units, early):
+    the frontier states, and any solutions completed above that depth.
+    """
+    frontier, early = [problem.root()], []
+    for _ in range(depth):
+        next_frontier = []
+        for state in frontier:
+            if problem.is_complete(state):
+                early.append(problem.solution(state))
+                continue
+            for choice in problem.choices(state):
+                child = problem.extend(state, choice)
+                if problem.feasible(child) and problem.promising(child):
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return frontier, early
+
+_stop_event = None
+
+def _init_worker(event):
+    global _stop_event
+    _stop_event = event
+
+def _run_unit(problem, state, first):
+    return list(search(problem, start=state, first=first, stop_event=_stop_event))
+
+def parallel_search(problem, split_depth=2, workers=None, first=False):
+    """
+    Like solve(), with the subtrees below split_depth searched in parallel.
+    The problem object must be picklable (a module-level class).
+    """
+    units, early = split_work(problem, split_depth)
+    if first and early:
+        return early[0]
+    workers = workers or os.cpu_count() or 1
+    event = multiprocessing.get_context().Event()
+    solutions = list(early)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(event,)) as pool:
+        pending = {pool.submit(_run_unit, problem, unit, first) for unit in units}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found = future.result()
+                if first and found:
+                    event.set()
+                    for other in pending:
+                        other.cancel()
+                    return found[0]
+                solutions.extend(found)
+    return None if first else solutions
+
+# 4. Bitmask Solvers
+def permutations(items):
+    """
+    Yields every ordering of items; the used set is a bitmask. stack[d] holds
+    the items not yet tried at depth d.
+    """
+    n = len(items)
+    if n == 0:
+        yield ()
+        return
+    full = (1 << n) - 1
+    order, used, stack = [], 0, [full]
+    while stack:
+        free = stack[-1]
+        if not free:
+            stack.pop()
+            if order:
+                used ^= 1 << order.pop()
+            continue
+        bit = free & -free
+        stack[-1] = free ^ bit
+        order.append(bit.bit_length() - 1)
+        used |= bit
+        if used == full:
+            yield tuple(items[i] for i in order)
+            order.pop()
+            used ^= bit
+        else:
+            stack.append(full & ~used)
+
+def combinations(items, k):
+    """
+    Yields every k-element combination, stepping directly from one k-bit mask
+    to the next (Gosper's hack). Masks ascend numerically, so combinations come
+    out in colexicographic order: (1, 2), (1, 3), (2, 3), (1, 4), ...
+    """
+    n = len(items)
+    if k < 0 or k > n:
+        return
+    if k == 0:
+        yield ()
+        return
+    mask, limit = (1 << k) - 1, 1 << n
+    while mask < limit:
+        # Bit i set = item i chosen; reading bits low-to-high keeps items in order.
+        yield tuple(items[i] for i in range(n) if mask >> i & 1)
+        low = mask & -mask
+        ripple = mask + low
+        mask = (((ripple ^ mask) >> 2) // low) | ripple
+
+def n_queens(n, first=False):
+    """
+    Solutions as tuples of column indices per row. Columns and both diagonals
+    are three bitmasks, shifted one step per row.
+    """
+    results = []
+    for placement in _queens(n):
+        results.append(tuple(placement))
+        if first:
+            break
+    return (results[0] if results else None) if first else results
+
+def n_queens_count(n):
+    return sum(1 for _ in _queens(n))
+
+def _queens(n):
+    # Yields the shared placement list at each full board; copy it to keep it.
+    # stack[d] is (cols, left, right, free squares not yet tried) for row d.
+    full = (1 << n) - 1
+    placement = []
+    if n == 0:
+        yield placement
+        return
+    stack = [(0, 0, 0, full)]
+    while stack:
+        cols, left, right, free = stack[-1]
+        if not free:
+            stack.pop()
+            if placement:
+                placement.pop()
+            continue
+        bit = free & -free
+        stack[-1] = (cols, left, right, free ^ bit)
+        placement.append(bit.bit_length() - 1)
+        cols, left, right = cols | bit, ((left | bit) << 1) & full, (right | bit) >> 1
+        if cols == full:
+            yield placement
+            placement.pop()
+        else:
+            stack.append((cols, left, right, full & ~(cols | left | right)))
+
+def subset_sum(nums, target, first=True):
+    """
+    Subsets of non-negative nums summing to target, as lists of values, largest
+    first. Prunes on overshoot and on "even taking everything left cannot reach
+    the target". Runs SubsetSumProblem through the iterative search().
+    """
+    return solve(SubsetSumProblem(nums, target), first=first)
+
+# 5. Problems for the Parallel Framework
+class NQueensProblem(Problem):
+    """
+    State: (row, cols, left, right, placement).
+    """
+    def __init__(self, n):
+        self.n = n
+        self.full = (1 << n) - 1
+
+    def root(self):
+        return (0, 0, 0, 0, ())
+
+    def choices(self, state):
+        _, cols, left, right, _ = state
+        free = self.full & ~(cols | left | right)
+        while free:
+            bit = free & -free
+            free ^= bit
+            yield bit
+
+    def extend(self, state, bit):
+        row, cols, left, right, placement = state
+        return (row + 1, cols | bit, ((left | bit) << 1) & self.full,
+                (right | bit) >> 1, placement + (bit.bit_length() - 1,))
+
+    def is_complete(self, state):
+        return state[0] == self.n
+
+    def solution(self, state):
+        return state[4]
+
+class SubsetSumProblem(Problem):
+    """
+    State: (next index, running total, chosen bitmask), values sorted descending.
+    """
+    def __init__(self, nums, target):
+        self.values = sorted(nums, reverse=True)
+        self.target = target
+        self.suffix = [0] * (len(self.values) + 1)
+        for i in range(len(self.values) - 1, -1, -1):
+            self.suffix[i] = self.suffix[i + 1] + self.values[i]
+
+    def root(self):
+        return (0, 0, 0)
+
+    def choices(self, state):
+        return () if state[0] == len(self.values) else (True, False)
+
+    def extend(self, state, take):
+        i, total, mask = state
+        if take:
+            return (i + 1, total + self.values[i], mask | 1 << i)
+        return (i + 1, total, mask)
+
+    def is_complete(self, state):
+        return state[1] == self.target
+
+    def feasible(self, state):
+        return state[1] <= self.target
+
+    def promising(self, state):
+        i, total, _ = state
+        return total + self.suffix[i] >= self.target
+
+    def solution(self, state):
+        i, _, mask = state
+        return [self.values[j] for j in range(i) if mask >> j & 1]
+
+if __name__ == "__main__":
+    print("Permutations of abc:", ["".join(p) for p in permutations("abc")])
+    print("2-combinations of 1..4:", list(combinations([1, 2, 3, 4], 2)))
+    print("8 queens:", n_queens_count(8), "solutions, first:", n_queens(8, first=True))
+    print("Subset of [8, 6, 7, 5, 3, 10, 9] summing to 15:", subset_sum([8, 6, 7, 5, 3, 10, 9], 15))
+
+    print("10 queens in parallel:", len(parallel_search(NQueensProblem(10), split_depth=2)))
+    print("First subset in parallel:",
+          parallel_search(SubsetSumProblem(list(range(1, 40)), 391), split_depth=4, first=True))
@@ -0,0 +1,189 @@
+# Binary Search as a Building Block
+#
+# The binary_search in BinarySearch.md and Sandbox.py recurses once per step,
+# calls math.floor on a float division, and returns a sentence instead of an
+# index - fine for learning the idea, but not something other code can build on.
+# Everything here returns integer indices, loops instead of recursing, and
+# follows the bisect module's lower/upper bound conventions:
+#
+#   lower_bound(a, x): first index i with a[i] >= x  (bisect_left)
+#   upper_bound(a, x): first index i with a[i] >  x  (bisect_right)
+#
+# For millions of lookups against one static sorted array there is also an
+# Eytzinger layout: the same values stored in BFS order of the implicit search
+# tree (children of node k at 2k and 2k + 1). The first few levels of every
+# search then touch the same few cache lines, and with NumPy a whole batch of
+# queries walks down the tree one level at a time, as array operations.
+
+import bisect
+
+# 1. Iterative Search
+def binary_search(array, target):
+    """
+    Returns the index of target in a sorted array, or -1 if it is absent.
+    """
+    lo, hi = 0, len(array) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        value = array[mid]
+        if value == target:
+            return mid
+        if value < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+
+def lower_bound(array, target, lo=0, hi=None):
+    """
+    First index whose value is >= target (len(array) if none).
+    """
+    hi = len(array) if hi is None else hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if array[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def upper_bound(array, target, lo=0, hi=None):
+    """
+    First index whose value is > target (len(array) if none).
+    """
+    hi = len(array) if hi is None else hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if target < array[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+# 2. bisect-Backed Search (the loop runs in C)
+def bisect_search(array, target):
+    """
+    Same contract as binary_search, using the C bisect module.
+    """
+    i = bisect.bisect_left(array, target)
+    return i if i < len(array) and array[i] == target else -1
+
+bisect_lower_bound = bisect.bisect_left
+bisect_upper_bound = bisect.bisect_right
+
+def equal_range(array, target):
+    """
+    (first, stop) indices of the run of values equal to target.
+    """
+    return bisect.bisect_left(array, target), bisect.bisect_right(array, target)
+
+# 3. Eytzinger Layout
+class Eytzinger:
+    """
+    A static sorted array re-laid in BFS order for cache-friendly lookups.
+    Slot 0 is unused; node k has children 2k and 2k + 1. rank[k] maps a node
+    back to its index in the sorted array (rank[0] == n means "past the end").
+    """
+    def __init__(self, sorted_values):
+        self.sorted = list(sorted_values)
+        n = self.n = len(self.sorted)
+        self.tree = [None] * (n + 1)
+        self.rank = [n] * (n + 1)
+        # In-order walk of the implicit tree, done with an explicit stack.
+        i, k, stack = 0, 1, []
+        while stack or k <= n:
+            if k <= n:
+                stack.append(k)
+                k = 2 * k
+            else:
+                k = stack.pop()
+                self.tree[k] = self.sorted[i]
+                self.rank[k] = i
+                i += 1
+                k = 2 * k + 1
+        self._arrays = None
+
+    def lower_bound(self, target):
+        """
+        Index into the sorted array of the first value >= target.
+        """
+        tree, n, k = self.tree, self.n, 1
+        while k <= n:
+            k = 2 * k + (tree[k] < target)
+        # Undo the trailing right turns plus the final left turn that
+        # overshot: the answer is where we last went left.
+        k >>= ((~k & (k + 1)).bit_length())
+        return self.rank[k]
+
+    def __contains__(self, target):
+        i = self.lower_bound(target)
+        return i < self.n and self.sorted[i] == target
+
+    def search(self, target):
+        i = self.lower_bound(target)
+        return i if i < self.n and self.sorted[i] == target else -1
+
+    # 4. Vectorized Batch Lookups
+    def _numpy_arrays(self):
+        if self._arrays is None:
+            import numpy as np
+
+            sorted_arr = np.asarray(self.sorted)
+            levels = self.n.bit_length()
+            # Pad to a full tree; padded nodes (k > n) always send the query right.
+            tree = np.zeros(1 << levels, dtype=sorted_arr.dtype)
+            tree[1:self.n + 1] = np.asarray(self.tree[1:], dtype=sorted_arr.dtype)
+            self._arrays = (sorted_arr, tree, np.asarray(self.rank, dtype=np.int64), levels)
+        return self._arrays
+
+    def lower_bound_batch(self, targets):
+        """
+        lower_bound for a whole array of queries at once, with NumPy.
+        """
+        import numpy as np
+
+        sorted_arr, tree, rank, levels = self._numpy_arrays()
+        targets = np.asarray(targets)
+        k = np.ones(targets.shape, dtype=np.int64)
+        for _ in range(levels):
+            go_right = (k > self.n) | (tree[k] < targets)
+            k = 2 * k + go_right
+        # Strip trailing ones and one zero: shift by the position of the lowest
+        # zero bit, plus one. (k + 1) & ~k isolates that bit as a power of two.
+        lowest_zero = (k + 1) & ~k
+        k >>= np.log2(lowest_zero).astype(np.int64) + 1
+        return rank[k]
+
+    def contains_batch(self, targets):
+        """
+        Boolean array: is each query present in the sorted values?
+        """
+        import numpy as np
+
+        sorted_arr = self._numpy_arrays()[0]
+        targets = np.asarray(targets)
+        idx = self.lower_bound_batch(targets)
+        found = idx < self.n
+        found[found] = sorted_arr[idx[found]] == targets[found]
+        return found
+
+if __name__ == "__main__":
+    import random
+    import timeit
+
+    arr = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    target = random.randint(1, 10)
+    print(f"Target {target} found at index {binary_search(arr, target)}")
+    print("Bounds of 4 in [1, 2, 4, 4, 4, 7]:", equal_range([1, 2, 4, 4, 4, 7], 4))
+
+    data = sorted(random.sample(range(10_000_000), 1_000_000))
+    queries = [random.randrange(10_000_000) for _ in range(100_000)]
+    layout = Eytzinger(data)
+    for name, func in [("binary_search", lambda: [binary_search(data, q) for q in queries]),
+                       ("bisect_search", lambda: [bisect_search(data, q) for q in queries]),
+                       ("eytzinger", lambda: [layout.search(q) for q in queries])]:
+        print(f"{name:>14}: {timeit.timeit(func, number=1):.3f}s for {len(queries)} queries")
+    try:
+        print(f"{'eytz batch':>14}: {timeit.timeit(lambda: layout.contains_batch(queries), number=1):.3f}s")
+    except ImportError:
+        pass
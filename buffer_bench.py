@@ -0,0 +1,73 @@
+# List vs Buffer Inputs for lc_patterns
+#
+# Measures what the buffer-protocol path in lc_patterns saves. For each pattern
+# it runs three ways over the same data:
+#
+#   - list:           the data already lives in a list of Python ints
+#   - list(convert):  the data arrives as array('q') and is copied to a list
+#                     first, which is what callers had to do before
+#   - buffer:         the array('q') is passed straight in (memoryview path)
+#
+# and reports the tracemalloc peak (bytes allocated during the call, including
+# any conversion) and wall time.
+
+import random
+import time
+import tracemalloc
+from array import array
+
+import lc_patterns
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+def benchmark(n=1_000_000, seed=0):
+    """
+    Returns {pattern: {mode: (peak_bytes, seconds)}}.
+    """
+    rng = random.Random(seed)
+    as_list = [rng.randrange(-1000, 1000) for _ in range(n)]
+    as_array = array("q", as_list)
+    sorted_array = array("q", sorted(as_list))
+    rotated = sorted_array[n // 3:] + sorted_array[:n // 3]
+    target = sorted_array[n // 2]
+
+    patterns = {
+        "prefix_sum": lambda data: lc_patterns.prefix_sum(data),
+        "max_sum_subarray": lambda data: lc_patterns.max_sum_subarray(data, 100),
+        "next_greater_element": lambda data: lc_patterns.next_greater_element(data),
+        "two_pointers": lambda data: lc_patterns.two_pointers(data, 3 * 1000),
+        "search_rotated_array": lambda data: lc_patterns.search_rotated_array(data, target),
+    }
+    inputs = {
+        "two_pointers": sorted_array,
+        "search_rotated_array": rotated,
+    }
+
+    results = {}
+    for name, run in patterns.items():
+        buffer_input = inputs.get(name, as_array)
+        list_input = list(buffer_input)
+        results[name] = {
+            "list": _measure(lambda: run(list_input)),
+            "list(convert)": _measure(lambda: run(list(buffer_input))),
+            "buffer": _measure(lambda: run(buffer_input)),
+        }
+    return results
+
+def format_results(results):
+    lines = [f"{'pattern':<22} {'mode':<14} {'peak MiB':>9} {'seconds':>8}"]
+    for name, modes in results.items():
+        for mode, (peak, seconds) in modes.items():
+            lines.append(f"{name:<22} {mode:<14} {peak / 2**20:>9.2f} {seconds:>8.3f}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    print()
+    print(format_results(benchmark()))
@@ -0,0 +1,428 @@
+# LRU, LFU and TTL Caches
+#
+# module_7 in python_tour.py shows OrderedDict only for keeping insertion order.
+# Its other trick, move_to_end() in O(1), is exactly what a least-recently-used
+# cache needs: the front of the dict is always the next entry to evict. This
+# module builds three eviction policies on that idea, all behaving like a dict:
+#
+#   - LRUCache: evicts the least recently used entry.
+#   - LFUCache: evicts the least frequently used entry, O(1) via frequency
+#     buckets (one OrderedDict per use count, ties broken by recency).
+#   - TTLCache: entries expire after a per-entry time-to-live, LRU when full.
+#
+# Limits are in weight: by default every entry weighs 1 (so maxsize is an entry
+# count); pass weigh=sizeof_weigh to bound approximate bytes instead. The Sync*
+# variants add a lock for sharing between threads. Use any of them directly as
+# a mapping, or wrap a function with @cached(cache).
+
+import functools
+import heapq
+import itertools
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import ItemsView, MutableMapping, ValuesView
+
+def unit_weigh(key, value):
+    return 1
+
+def sizeof_weigh(key, value):
+    """
+    Shallow size in bytes of key and value (sys.getsizeof does not follow
+    references, so containers count only their own header and slots).
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+# 1. Statistics
+class CacheStats:
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "expirations": self.expirations, "hit_ratio": self.hit_ratio}
+
+    def __repr__(self):
+        return f"CacheStats({self.as_dict()})"
+
+# 2. Shared Cache Behaviour
+class _BaseCache(MutableMapping):
+    """
+    Weight accounting, statistics and the mapping protocol. Subclasses supply
+    the policy through _get, _put, _pop and _evict; each returns or frees a
+    weight, and _evict records its own eviction in the stats. Only cache[key]
+    counts as a use: get(), items() and values() read through _peek, which
+    leaves recency, use counts and stats alone (dict(cache) uses cache[key];
+    dict(cache.items()) copies without touching anything).
+    """
+    def __init__(self, maxsize=128, weigh=unit_weigh):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.weigh = weigh
+        self.currsize = 0
+        self.stats = CacheStats()
+
+    def __getitem__(self, key):
+        try:
+            value = self._get(key)
+        except KeyError:
+            self.stats.misses += 1
+            raise
+        self.stats.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._set(key, value)
+
+    def _set(self, key, value, *extra):
+        weight = self.weigh(key, value)
+        if weight > self.maxsize:
+            raise ValueError(f"value too large for cache (weight {weight} > {self.maxsize})")
+        if key in self._data:
+            self.currsize -= self._pop(key)
+        while self.currsize + weight > self.maxsize:
+            self.currsize -= self._evict()
+        self._put(key, value, weight, *extra)
+        self.currsize += weight
+
+    def __delitem__(self, key):
+        self.currsize -= self._pop(key)
+
+    def __contains__(self, key):
+        # Membership does not count as a use, and does not touch the stats.
+        return key in self._data
+
+    def __iter__(self):
+        # A snapshot, so that cache[key] (which reorders _data) is safe inside
+        # the loop, as in dict(cache).
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def _peek(self, key):
+        return self._data[key][0]
+
+    def get(self, key, default=None):
+        try:
+            return self._peek(key)
+        except KeyError:
+            return default
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+    def clear(self):
+        self._data.clear()
+        self.currsize = 0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(maxsize={self.maxsize}, currsize={self.currsize}, stats={self.stats})"
+
+class _ItemsView(ItemsView):
+    def __contains__(self, item):
+        key, value = item
+        try:
+            v = self._mapping._peek(key)
+        except KeyError:
+            return False
+        return v is value or v == value
+
+    def __iter__(self):
+        for key in self._mapping:
+            try:
+                yield key, self._mapping._peek(key)
+            except KeyError:
+                pass  # expired or deleted since the snapshot
+
+class _ValuesView(ValuesView):
+    def __contains__(self, value):
+        return any(v is value or v == value for v in self)
+
+    def __iter__(self):
+        for _, value in _ItemsView(self._mapping):
+            yield value
+
+# 3. LRU
+class LRUCache(_BaseCache):
+    def __init__(self, maxsize=128, weigh=unit_weigh):
+        super().__init__(maxsize, weigh)
+        self._data = OrderedDict()  # key -> (value, weight), oldest use first
+
+    def _get(self, key):
+        value, _ = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def _put(self, key, value, weight):
+        self._data[key] = (value, weight)
+
+    def _pop(self, key):
+        return self._data.pop(key)[1]
+
+    def _evict(self):
+        _, (_, weight) = self._data.popitem(last=False)
+        self.stats.evictions += 1
+        return weight
+
+# 4. LFU
+class LFUCache(_BaseCache):
+    def __init__(self, maxsize=128, weigh=unit_weigh):
+        super().__init__(maxsize, weigh)
+        self._data = {}  # key -> [value, weight, use count]
+        self._buckets = {}  # use count -> OrderedDict of keys, oldest use first
+        self._min_count = 0
+
+    def _unlink(self, key, count):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+
+    def _get(self, key):
+        entry = self._data[key]
+        count = entry[2]
+        self._unlink(key, count)
+        if self._min_count == count and count not in self._buckets:
+            self._min_count = count + 1
+        entry[2] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+        return entry[0]
+
+    def _put(self, key, value, weight):
+        self._data[key] = [value, weight, 1]
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def _pop(self, key):
+        _, weight, count = self._data.pop(key)
+        self._unlink(key, count)
+        if count == self._min_count and count not in self._buckets:
+            # Only explicit deletes get here; the scan is over distinct counts.
+            self._min_count = min(self._buckets, default=0)
+        return weight
+
+    def _evict(self):
+        if self._min_count not in self._buckets:
+            self._min_count = min(self._buckets)
+        key, _ = self._buckets[self._min_count].popitem(last=False)
+        if not self._buckets[self._min_count]:
+            del self._buckets[self._min_count]
+        self.stats.evictions += 1
+        return self._data.pop(key)[1]
+
+    def clear(self):
+        super().clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+# 5. TTL
+class TTLCache(_BaseCache):
+    """
+    LRU cache whose entries also expire ttl seconds after they are set. Use
+    set(key, value, ttl=...) for a per-entry TTL. Expired entries are dropped
+    lazily on access, and first in line whenever space is needed.
+    """
+    def __init__(self, maxsize=128, ttl=60.0, weigh=unit_weigh, timer=time.monotonic):
+        super().__init__(maxsize, weigh)
+        self.ttl = ttl
+        self.timer = timer
+        self._data = OrderedDict()  # key -> (value, weight, expires_at, seq)
+        self._expiry_heap = []  # (expires_at, seq, key); stale items skipped lazily
+        self._seq = itertools.count()
+
+    def set(self, key, value, ttl=None):
+        self._set(key, value, self.ttl if ttl is None else ttl)
+
+    def __setitem__(self, key, value):
+        self._set(key, value, self.ttl)
+
+    def _get(self, key):
+        value, _, expires_at, _ = self._data[key]
+        if expires_at <= self.timer():
+            self.currsize -= self._pop(key)
+            self.stats.expirations += 1
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        return value
+
+    def _peek(self, key):
+        value, _, expires_at, _ = self._data[key]
+        if expires_at <= self.timer():
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        now = self.timer()
+        return iter([key for key, entry in self._data.items() if entry[2] > now])
+
+    def _put(self, key, value, weight, ttl):
+        expires_at = self.timer() + ttl
+        seq = next(self._seq)
+        self._data[key] = (value, weight, expires_at, seq)
+        heapq.heappush(self._expiry_heap, (expires_at, seq, key))
+        if len(self._expiry_heap) > 2 * len(self._data) + 64:
+            self._compact_heap()
+
+    def _pop(self, key):
+        return self._data.pop(key)[1]
+
+    def _evict(self):
+        now = self.timer()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            if entry is not None and entry[3] == seq:
+                del self._data[key]
+                self.stats.expirations += 1
+                return entry[1]
+        _, (_, weight, _, _) = self._data.popitem(last=False)
+        self.stats.evictions += 1
+        return weight
+
+    def _compact_heap(self):
+        self._expiry_heap = [(e[2], e[3], k) for k, e in self._data.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def expire(self):
+        """
+        Drops every expired entry now. Returns how many were dropped.
+        """
+        now = self.timer()
+        expired = [key for key, entry in self._data.items() if entry[2] <= now]
+        for key in expired:
+            self.currsize -= self._pop(key)
+        self.stats.expirations += len(expired)
+        self._compact_heap()
+        return len(expired)
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and entry[2] > self.timer()
+
+    def clear(self):
+        super().clear()
+        self._expiry_heap.clear()
+
+# 6. Thread-Safe Variants
+class _Locked:
+    """
+    Serializes every mapping operation with one re-entrant lock.
+    """
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            super().__delitem__(key)
+
+    def __contains__(self, key):
+        with self._lock:
+            return super().__contains__(key)
+
+    def __len__(self):
+        with self._lock:
+            return super().__len__()
+
+    def __iter__(self):
+        with self._lock:
+            return super().__iter__()
+
+    def _peek(self, key):
+        with self._lock:
+            return super()._peek(key)
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+
+class SyncLRUCache(_Locked, LRUCache):
+    pass
+
+class SyncLFUCache(_Locked, LFUCache):
+    pass
+
+class SyncTTLCache(_Locked, TTLCache):
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            super().set(key, value, ttl)
+
+    def expire(self):
+        with self._lock:
+            return super().expire()
+
+# 7. Decorator
+_KWARGS_MARK = object()
+
+def make_key(args, kwargs):
+    if not kwargs:
+        return args[0] if len(args) == 1 and type(args[0]) in (int, str) else args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+def cached(cache, key=make_key):
+    """
+    Memoizes a function in the given cache. Arguments must be hashable.
+    The cache is available as wrapper.cache for stats and clearing.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            k = key(args, kwargs)
+            try:
+                return cache[k]
+            except KeyError:
+                pass
+            value = func(*args, **kwargs)
+            try:
+                cache[k] = value
+            except ValueError:
+                pass  # too large to cache; still return it
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+if __name__ == "__main__":
+    lru = LRUCache(maxsize=2)
+    lru["a"], lru["b"] = 1, 2
+    lru["a"]
+    lru["c"] = 3  # evicts "b", the least recently used
+    print("LRU keys:", list(lru), lru.stats)
+
+    lfu = LFUCache(maxsize=2)
+    lfu["a"], lfu["b"] = 1, 2
+    lfu["a"], lfu["a"], lfu["b"]
+    lfu["c"] = 3  # evicts "b", used once against "a"'s twice
+    print("LFU keys:", list(lfu), lfu.stats)
+
+    @cached(SyncLRUCache(maxsize=1024))
+    def slow_square(n):
+        time.sleep(0.01)
+        return n * n
+
+    for n in [1, 2, 1, 1, 3, 2]:
+        slow_square(n)
+    print("Decorator:", slow_square.cache.stats)
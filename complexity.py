@@ -0,0 +1,314 @@
+# Empirical Complexity Profiling
+#
+# dsa.md, Hash.md and BinarySearch.md state complexities ("lookup is O(1)",
+# "binary search is O(log n)") that nothing checks, and accidental O(n^2) code -
+# list.pop(0) as a queue, path + [x] in a loop - passes every functional test.
+# This profiler measures instead of trusting:
+#
+#   1. Run the callable on inputs of growing size n (doubling by default, over
+#      a 1024x range), recording the median of k wall times and, in a separate
+#      run, the tracemalloc peak. Inputs are built outside the measurement.
+#      Once a single run takes longer than the time budget, n stops growing, so
+#      accidentally quadratic code fails in seconds instead of running for hours.
+#   2. Fit each candidate class t(n) = c * f(n), for f in 1, log n, n, n log n,
+#      n^2, 2^n. The fit is done on log t, so every size counts equally rather
+#      than the largest one drowning out the rest.
+#   3. Turn the residuals into a confidence: every model has one parameter, so
+#      the relative likelihoods (Akaike weights) reduce to rss ** (-points / 2),
+#      normalised to sum to 1.
+#   4. Neighbouring classes - n against n log n above all - differ by a slowly
+#      growing factor that cache effects and timer noise easily imitate, so a
+#      high confidence alone is not trusted. A neighbour of the best fit stays
+#      plausible while it still has real weight or its own log-log slope over
+#      the measured sizes is close to the measured slope.
+#
+# assert_complexity() wraps this as a test assertion, passing when the expected
+# class is among the plausible ones:
+#
+#   assert_complexity(lc_patterns.prefix_sum, lambda n: list(range(n)), "n")
+#
+# Exponential algorithms need arithmetic sizes (sizes=range(10, 20)), since
+# doubling n would square their running time at every step.
+
+import gc
+import math
+import statistics
+import time
+import tracemalloc
+from collections import namedtuple
+
+# log f(n) for each class, so 2^n never overflows.
+CLASSES = {
+    "O(1)": lambda n: 0.0,
+    "O(log n)": lambda n: math.log(math.log2(n)),
+    "O(n)": lambda n: math.log(n),
+    "O(n log n)": lambda n: math.log(n) + math.log(math.log2(n)),
+    "O(n^2)": lambda n: 2 * math.log(n),
+    "O(2^n)": lambda n: n * math.log(2),
+}
+
+ALIASES = {
+    "1": "O(1)", "constant": "O(1)",
+    "log n": "O(log n)", "logn": "O(log n)", "logarithmic": "O(log n)",
+    "n": "O(n)", "linear": "O(n)",
+    "n log n": "O(n log n)", "nlogn": "O(n log n)", "linearithmic": "O(n log n)",
+    "n^2": "O(n^2)", "n2": "O(n^2)", "quadratic": "O(n^2)",
+    "2^n": "O(2^n)", "exponential": "O(2^n)",
+}
+
+def complexity_class(name):
+    """
+    The canonical class name for "O(n)", "n", "linear" and the like.
+    """
+    if name in CLASSES:
+        return name
+    key = name.strip().lower()
+    if key.startswith("o(") and key.endswith(")"):
+        key = key[2:-1]
+    try:
+        return ALIASES[key.replace("*", " ").strip()]
+    except KeyError:
+        raise ValueError(f"unknown complexity class {name!r}; choose from {list(CLASSES)}") from None
+
+ORDER = list(CLASSES)
+
+# A neighbouring class stays plausible with at least this much weight, or with
+# a log-log slope this close to the measured one.
+AMBIGUOUS_CONFIDENCE = 0.05
+SLOPE_TOLERANCE = 0.2
+
+# Seconds one run may take before no larger sizes are tried.
+TIME_BUDGET = 1.0
+
+Fit = namedtuple("Fit", ["name", "confidence", "coefficient", "rss"])
+
+# 1. Fitting
+def _log_values(values):
+    floor = max(min((v for v in values if v > 0), default=1.0), 1e-12) / 2
+    return [math.log(max(v, floor)) for v in values]
+
+def fit(sizes, values):
+    """
+    Fits values (times or bytes) against every class. Returns Fits sorted from
+    best to worst. Values at or below zero are floored so that "nothing
+    measurable" reads as constant.
+    """
+    if len(sizes) < 3:
+        raise ValueError("need at least three sizes to fit")
+    if min(sizes) < 2:
+        raise ValueError("sizes must be at least 2 (log log n is undefined below)")
+    log_values = _log_values(values)
+    raw = []
+    for name, log_f in CLASSES.items():
+        logs = [log_f(n) for n in sizes]
+        # Least squares for log c in log v = log c + log f(n) is the mean gap.
+        log_c = sum(v - f for v, f in zip(log_values, logs)) / len(sizes)
+        rss = sum((v - f - log_c) ** 2 for v, f in zip(log_values, logs))
+        raw.append((name, log_c, rss))
+    # Akaike weights for one-parameter models: exp(-m/2 * log(rss)), computed
+    # relative to the best model so nothing underflows.
+    m = len(sizes)
+    best_rss = max(min(rss for _, _, rss in raw), 1e-12)
+    weights = [math.exp(-m / 2 * (math.log(max(rss, 1e-12)) - math.log(best_rss))) for _, _, rss in raw]
+    total = sum(weights)
+    fits = [Fit(name, w / total, math.exp(log_c), rss)
+            for (name, log_c, rss), w in zip(raw, weights)]
+    return sorted(fits, key=lambda f: -f.confidence)
+
+def _slope(sizes, log_values):
+    xs = [math.log(n) for n in sizes]
+    mx, my = sum(xs) / len(xs), sum(log_values) / len(log_values)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, log_values)) / sxx if sxx else 0.0
+
+def loglog_slope(sizes, values):
+    """
+    Least-squares slope of log(value) against log(n): about 1 for linear, 2
+    for quadratic. A cross-check on the class fit.
+    """
+    return _slope(sizes, _log_values(values))
+
+def class_slope(name, sizes):
+    """
+    The log-log slope a class would show over these sizes: 1 for O(n), and
+    about 1.1 for O(n log n) over 1024..1M.
+    """
+    return _slope(sizes, [CLASSES[name](n) for n in sizes])
+
+def plausible(fits, sizes, values, confidence=AMBIGUOUS_CONFIDENCE, tolerance=SLOPE_TOLERANCE):
+    """
+    The best class, plus each neighbouring class that the data cannot rule
+    out: one with at least `confidence` weight, or whose expected slope is
+    within `tolerance` of the measured slope.
+    """
+    best = fits[0].name
+    weight = {f.name: f.confidence for f in fits}
+    measured = loglog_slope(sizes, values)
+    names = [best]
+    i = ORDER.index(best)
+    for neighbour in ORDER[max(i - 1, 0):i + 2]:
+        if neighbour != best and (weight[neighbour] >= confidence or
+                                  abs(class_slope(neighbour, sizes) - measured) <= tolerance):
+            names.append(neighbour)
+    return names
+
+# 2. Measuring
+class Profile:
+    """
+    Measurements for one callable: sizes, median times (seconds),
+    tracemalloc peaks (bytes), and the time and memory fits. skipped lists
+    the sizes left out once a run went over the time budget.
+    """
+    def __init__(self, name, sizes, times, peaks, skipped=()):
+        self.name = name
+        self.sizes = sizes
+        self.skipped = list(skipped)
+        self.times = times
+        self.peaks = peaks
+        self.time_fits = fit(sizes, times)
+        self.memory_fits = fit(sizes, peaks) if peaks else []
+        self.candidates = plausible(self.time_fits, sizes, times)
+        self.memory_candidates = plausible(self.memory_fits, sizes, peaks) if peaks else []
+
+    @property
+    def best(self):
+        return self.time_fits[0]
+
+    @property
+    def best_memory(self):
+        return self.memory_fits[0] if self.memory_fits else None
+
+    def __str__(self):
+        def verdict(fits, candidates):
+            text = f"{fits[0].name} ({fits[0].confidence:.0%} confidence"
+            if len(candidates) > 1:
+                text += ", ambiguous with " + " / ".join(candidates[1:])
+            return text + ")"
+
+        lines = [f"{self.name}: time {verdict(self.time_fits, self.candidates)}, "
+                 f"log-log slope {loglog_slope(self.sizes, self.times):.2f}"]
+        if self.best_memory:
+            lines[0] += f"; memory {verdict(self.memory_fits, self.memory_candidates)}"
+        lines.append(f"  {'n':>10} {'seconds':>12} {'peak bytes':>12}")
+        for i, n in enumerate(self.sizes):
+            peak = f"{self.peaks[i]:>12,}" if self.peaks else f"{'-':>12}"
+            lines.append(f"  {n:>10,} {self.times[i]:>12.6f} {peak}")
+        if self.skipped:
+            lines.append(f"  stopped before n={self.skipped[0]:,}: a run went over the time budget")
+        lines.append("  fits: " + ", ".join(f"{f.name} {f.confidence:.0%}" for f in self.time_fits))
+        return "\n".join(lines)
+
+def doubling(start=1024, steps=11):
+    return [start << i for i in range(steps)]
+
+def profile(func, make_input, sizes=None, repeat=7, memory=True, name=None, budget=TIME_BUDGET):
+    """
+    Times func(make_input(n)) for each size (median of repeat runs, a fresh
+    input each run, so functions that mutate their input are fine). A single call
+    must take well over the timer's resolution; wrap sub-microsecond
+    operations in a loop of lookups, as the __main__ demo does for bisect.
+    After a run longer than budget seconds, larger sizes are skipped.
+    """
+    return _profile(func, make_input, sizes, repeat, memory, name, star=False, budget=budget)
+
+def profile_args(func, make_args, sizes=None, repeat=7, memory=True, name=None, budget=TIME_BUDGET):
+    """
+    Like profile(), for callables that take several arguments: make_args(n)
+    returns the argument tuple.
+    """
+    return _profile(func, make_args, sizes, repeat, memory, name, star=True, budget=budget)
+
+def _call(func, value, star):
+    return func(*value) if star else func(value)
+
+def _profile(func, make_input, sizes, repeat, memory, name, star, budget=TIME_BUDGET):
+    sizes = list(sizes) if sizes is not None else doubling()
+    times, peaks = [], []
+    measured = 0
+    gc_was_enabled = gc.isenabled()
+    try:
+        for n in sizes:
+            if times and max(runs) > budget:
+                break
+            measured += 1
+            runs = []
+            for _ in range(repeat):
+                value = make_input(n)
+                gc.disable()  # collections would land on random sizes
+                start = time.perf_counter()
+                _call(func, value, star)
+                runs.append(time.perf_counter() - start)
+                if gc_was_enabled:
+                    gc.enable()
+                if runs[-1] > budget:
+                    break  # this size is the last; no point repeating it either
+            # The median shrugs off both a lucky fast run and a stall.
+            times.append(statistics.median(runs))
+            if memory:
+                value = make_input(n)
+                tracemalloc.start()
+                try:
+                    _call(func, value, star)
+                    peaks.append(tracemalloc.get_traced_memory()[1])
+                finally:
+                    tracemalloc.stop()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return Profile(name or getattr(func, "__qualname__", repr(func)), sizes[:measured], times, peaks,
+                   skipped=sizes[measured:])
+
+# 3. As a Test Assertion
+def assert_complexity(func, make_input, expected, memory=None, min_confidence=0.0,
+                      star=False, **kwargs):
+    """
+    Profiles func and raises AssertionError (with the full report) unless
+    `expected` is among the plausible time classes - and, if given, `memory`
+    among the plausible memory classes. A neighbouring class only counts when
+    the measured log-log slope is also within SLOPE_TOLERANCE of the expected
+    class's slope. min_confidence applies to the expected class's weight
+    together with the neighbours it is ambiguous with. Returns the Profile.
+    """
+    result = _profile(func, make_input, kwargs.pop("sizes", None), kwargs.pop("repeat", 7),
+                      memory is not None, kwargs.pop("name", None), star,
+                      kwargs.pop("budget", TIME_BUDGET))
+    if kwargs:
+        raise TypeError(f"unexpected arguments: {', '.join(kwargs)}")
+    checks = [("time", complexity_class(expected), result.time_fits, result.candidates, result.times)]
+    if memory is not None:
+        checks.append(("memory", complexity_class(memory), result.memory_fits,
+                       result.memory_candidates, result.peaks))
+    for label, wanted, fits, candidates, values in checks:
+        weight = sum(f.confidence for f in fits if f.name in candidates)
+        consistent = wanted == fits[0].name or (
+            abs(class_slope(wanted, result.sizes) - loglog_slope(result.sizes, values)) <= SLOPE_TOLERANCE)
+        if wanted not in candidates or not consistent or weight < min_confidence:
+            raise AssertionError(f"expected {label} {wanted}\n{result}")
+    return result
+
+if __name__ == "__main__":
+    import bisect
+    from collections import deque
+
+    import lc_patterns
+
+    def drain_list(items):
+        while items:
+            items.pop(0)
+
+    def drain_deque(items):
+        while items:
+            items.popleft()
+
+    print()
+    print(assert_complexity(lc_patterns.prefix_sum, lambda n: list(range(n)), "linear", memory="linear"))
+    print(assert_complexity(drain_deque, lambda n: deque(range(n)), "n"))
+    print(profile(drain_list, lambda n: list(range(n)), sizes=doubling(2048, 6), repeat=2))
+
+    def lookups(items):
+        for target in range(0, len(items), max(1, len(items) // 1000)):
+            bisect.bisect_left(items, target)
+
+    # 1000 lookups per call at every size, so the cost per call grows with log n.
+    print(profile(lookups, lambda n: list(range(n)), sizes=doubling(1 << 12, 8), memory=False))
+    print(profile(lc_patterns.generate_subsets, lambda n: list(range(n)), sizes=range(8, 16), repeat=2))
@@ -0,0 +1,170 @@
+# Cycle Analysis: Entry Points, Lengths and Functional Graphs
+#
+# lc_patterns.has_cycle answers yes or no for a linked list. The same two
+# techniques can say where the cycle starts and how long it is:
+#
+#   - Floyd: slow/fast pointers meet inside the cycle; restart one pointer at
+#     the head and step both by one - they meet again at the entry point.
+#   - Brent: teleport a "tortoise" to the hare at powers of two. Finds the
+#     cycle length directly and usually calls step() fewer times than Floyd.
+#
+# Both work on anything with a step function, so they cover node objects
+# (step = lambda node: node.next) and integer sequences (x -> f(x)) alike.
+#
+# Our "lists" are often next-index arrays with millions of entries: next[i] is
+# the node after i, or -1 at an end. That is a functional graph, and
+# analyze_functional_graph() labels every node in one linear pass, using typed
+# arrays for all bookkeeping instead of per-node objects.
+
+from array import array
+from collections import namedtuple
+
+CycleInfo = namedtuple("CycleInfo", ["entry", "index", "length"])
+CycleInfo.__doc__ = """
+entry: the first node on the cycle (None if there is no cycle).
+index: steps from the start to the entry (mu); length: nodes on the cycle
+(lambda). Without a cycle, index is None and length 0.
+"""
+
+NO_CYCLE = CycleInfo(None, None, 0)
+
+def node_step(node):
+    return node.next
+
+# 1. Floyd
+def floyd(start, step=node_step):
+    """
+    Floyd's tortoise and hare. step(x) returns the next element, or None at
+    the end of a finite chain.
+    """
+    slow = fast = start
+    while True:
+        if fast is None:
+            return NO_CYCLE
+        fast = step(fast)
+        if fast is None:
+            return NO_CYCLE
+        fast = step(fast)
+        slow = step(slow)
+        if slow is fast or slow == fast:
+            break
+    # Distance head -> entry equals distance meeting point -> entry (mod length).
+    index, slow = 0, start
+    while not (slow is fast or slow == fast):
+        slow, fast = step(slow), step(fast)
+        index += 1
+    length, probe = 1, step(slow)
+    while not (probe is slow or probe == slow):
+        probe = step(probe)
+        length += 1
+    return CycleInfo(slow, index, length)
+
+# 2. Brent
+def brent(start, step=node_step):
+    """
+    Brent's algorithm: same result as floyd().
+    """
+    if start is None:
+        return NO_CYCLE
+    power = length = 1
+    tortoise, hare = start, step(start)
+    while not (tortoise is hare or tortoise == hare):
+        if hare is None:
+            return NO_CYCLE
+        if power == length:
+            tortoise = hare
+            power *= 2
+            length = 0
+        hare = step(hare)
+        length += 1
+    # Run one pointer `length` ahead, then step both until they meet.
+    tortoise = hare = start
+    for _ in range(length):
+        hare = step(hare)
+    index = 0
+    while not (tortoise is hare or tortoise == hare):
+        tortoise, hare = step(tortoise), step(hare)
+        index += 1
+    return CycleInfo(tortoise, index, length)
+
+# 3. Whole Functional Graphs
+FunctionalGraph = namedtuple("FunctionalGraph", ["tail", "cycle_id", "cycle_length"])
+FunctionalGraph.__doc__ = """
+tail[i]: steps from node i until it first stands on a cycle (0 for cycle nodes).
+For a node whose chain ends at -1 instead, the steps to the chain's last node.
+cycle_id[i]: the cycle node i eventually enters, or -1 if it never does.
+cycle_length[c]: the number of nodes on cycle c.
+"""
+
+def analyze_functional_graph(next_index):
+    """
+    Labels every node of the graph i -> next_index[i] in O(n) total time.
+    next_index may be a list, array, bytes-like or NumPy buffer; -1 (or any
+    out-of-range value) marks the end of a chain.
+    """
+    nxt = next_index if isinstance(next_index, (list, tuple)) else memoryview(next_index)
+    n = len(nxt)
+    UNSEEN, ON_PATH, DONE = 0, 1, 2
+    state = bytearray(n)
+    tail = array("q", bytes(8 * n))
+    cycle_id = array("q", [-1]) * n
+    position = array("q", bytes(8 * n))  # index of a node within the current walk
+    cycle_length = array("q")
+    path = array("q")
+
+    for root in range(n):
+        if state[root] != UNSEEN:
+            continue
+        del path[:]
+        u = root
+        # Walk forward until we fall off the end, reach labelled ground, or
+        # step back onto this same walk (a new cycle).
+        while 0 <= u < n and state[u] == UNSEEN:
+            state[u] = ON_PATH
+            position[u] = len(path)
+            path.append(u)
+            u = nxt[u]
+        stop = len(path)
+        if 0 <= u < n and state[u] == ON_PATH:
+            start = position[u]
+            cid = len(cycle_length)
+            cycle_length.append(stop - start)
+            for k in range(start, stop):
+                v = path[k]
+                state[v] = DONE
+                cycle_id[v] = cid
+            stop = start
+            next_tail, next_cid = 1, cid
+        elif 0 <= u < n:
+            next_tail, next_cid = tail[u] + 1, cycle_id[u]
+        else:
+            next_tail, next_cid = 0, -1
+        # Unwind the tail part of the walk, nearest the cycle (or end) first.
+        for k in range(stop - 1, -1, -1):
+            v = path[k]
+            state[v] = DONE
+            tail[v] = next_tail
+            cycle_id[v] = next_cid
+            next_tail += 1
+    return FunctionalGraph(tail, cycle_id, cycle_length)
+
+if __name__ == "__main__":
+    class ListNode:
+        def __init__(self, val):
+            self.val = val
+            self.next = None
+
+    nodes = [ListNode(i) for i in range(6)]
+    for a, b in zip(nodes, nodes[1:]):
+        a.next = b
+    nodes[-1].next = nodes[2]  # 0 -> 1 -> 2 -> 3 -> 4 -> 5 -> back to 2
+
+    info = floyd(nodes[0])
+    print("Floyd: entry", info.entry.val, "| steps to entry", info.index, "| length", info.length)
+    info = brent(nodes[0])
+    print("Brent: entry", info.entry.val, "| steps to entry", info.index, "| length", info.length)
+    print("x -> x*x + 1 mod 255 from 3:", brent(3, lambda x: (x * x + 1) % 255)[1:])
+
+    graph = analyze_functional_graph(array("q", [1, 2, 0, 2, 3, -1, 5, 8, 8]))
+    print("Tails:", list(graph.tail))
+    print("Cycle IDs:", list(graph.cycle_id), "| lengths:", list(graph.cycle_length))
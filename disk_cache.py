@@ -0,0 +1,323 @@
+# Content-Addressed Result Cache on Disk
+#
+# caches.cached memoizes inside one process: a restart, or a second worker,
+# starts cold. This module persists results instead, so re-running
+# python_tour's module_10/module_14 or an lc_patterns call on a big input skips
+# the work whenever the same code has already seen the same arguments.
+#
+#   - Key: BLAKE2b over the function's source code plus a canonical encoding of
+#     its arguments. Editing the function changes the key, so old entries are
+#     simply never read again (invalidation for free) and age out under LRU.
+#     Code the function calls is not hashed; list it in depends= if it matters.
+#   - Value: a small header plus a zlib-compressed pickle of (result, stdout).
+#     stdout is captured on request, because the tour modules print rather than
+#     return - a hit replays the printed output.
+#   - LRU on disk: a hit touches the file's mtime; when the directory grows past
+#     max_bytes, the oldest files by mtime are deleted (down to 90%). A running total of the
+#     entry sizes is kept in a small .size file, so a put costs O(1) and the
+#     directory is only scanned when that total goes over the limit.
+#   - Concurrent writers: each entry is written to a temp file and renamed into
+#     place, which is atomic, so readers see a whole entry or none. Two
+#     processes computing the same key write identical bytes. Unreadable or
+#     vanished entries count as misses.
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import io
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+
+from caches import CacheStats
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction runs unlocked
+    fcntl = None
+
+# 1. Keys
+def code_fingerprint(func, depends=()):
+    """
+    Digest of the source of func and of any functions it depends on.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for f in (func, *depends):
+        f = inspect.unwrap(f)
+        digest.update(f"{f.__module__}.{f.__qualname__}\0".encode())
+        try:
+            digest.update(inspect.getsource(f).encode())
+        except (OSError, TypeError):
+            # No source (e.g. defined in a REPL): fall back to the bytecode.
+            code = f.__code__
+            digest.update(code.co_code + repr(code.co_consts).encode())
+    return digest.digest()
+
+def _encode(value, update):
+    # A canonical byte encoding, fed straight into the hash: equal arguments
+    # give equal bytes in every process, unlike pickle (which depends on dict
+    # order and object identity).
+    if value is None or isinstance(value, bool):
+        update(b"N" if value is None else b"T" if value else b"F")
+    elif isinstance(value, int):
+        update(b"i" + str(value).encode() + b";")
+    elif isinstance(value, float):
+        update(b"f" + struct.pack("<d", value))
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        update(b"s" + struct.pack("<Q", len(data)))
+        update(data)
+    elif isinstance(value, (bytes, bytearray)):
+        update(b"b" + struct.pack("<Q", len(value)))
+        update(value)
+    elif isinstance(value, (list, tuple)):
+        update((b"l" if isinstance(value, list) else b"t") + struct.pack("<Q", len(value)))
+        # Big homogeneous lists of ints or floats - the usual lc_patterns input -
+        # are packed in one C-level pass instead of element by element.
+        kinds = set(map(type, value)) if len(value) > 16 else None
+        packed = None
+        if kinds == {int}:
+            try:
+                packed = b"Q", array("q", value)
+            except OverflowError:
+                pass
+        elif kinds == {float}:
+            packed = b"D", array("d", value)
+        if packed is not None:
+            tag, items = packed
+            update(tag)
+            update(items)
+        else:
+            for item in value:
+                _encode(item, update)
+    elif isinstance(value, dict):
+        update(b"d" + struct.pack("<Q", len(value)))
+        for key in sorted(value, key=repr):
+            _encode(key, update)
+            _encode(value[key], update)
+    elif isinstance(value, (set, frozenset)):
+        update(b"S")
+        _encode(sorted(value, key=repr), update)
+    else:
+        try:
+            view = memoryview(value)  # array, NumPy array, ...
+        except TypeError:
+            update(b"p" + pickle.dumps(value, protocol=4))
+        else:
+            update(b"m" + f"{type(value).__name__}:{view.format}:{view.shape}".encode())
+            # Contiguous buffers are hashed in place, without a copy.
+            update(view if view.c_contiguous else view.tobytes())
+
+def make_key(fingerprint, args, kwargs):
+    digest = hashlib.blake2b(fingerprint, digest_size=16)
+    _encode((args, kwargs), digest.update)
+    return digest.hexdigest()
+
+# 2. The Store
+class DiskCache:
+    """
+    A directory of entries, bounded to about max_bytes with LRU eviction.
+    """
+    _HEADER = struct.Struct("<4sBQ")  # magic, pickle protocol, uncompressed size
+    _MAGIC = b"DRC1"
+    _SUFFIX = ".bin"
+    _SIZE_FILE = ".size"
+    _LOW_WATER = 0.9  # evict down to this fraction, so scans are not back to back
+
+    def __init__(self, directory, max_bytes=256 * 2**20, compress_level=6):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.stats = CacheStats()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self._SUFFIX)
+
+    def get(self, key):
+        """
+        (True, value) on a hit, (False, None) on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            magic, _, size = self._HEADER.unpack_from(data)
+            if magic != self._MAGIC:
+                raise ValueError("not a cache entry")
+            payload = zlib.decompress(data[self._HEADER.size:])
+            if len(payload) != size:
+                raise ValueError("truncated cache entry")
+            value = pickle.loads(payload)
+        except (OSError, ValueError, struct.error, zlib.error, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError):
+            # AttributeError/ImportError: the pickled class was moved or renamed.
+            self.stats.misses += 1
+            return False, None
+        with contextlib.suppress(OSError):
+            os.utime(path)  # mark as recently used
+        self.stats.hits += 1
+        return True, value
+
+    def put(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        body = zlib.compress(payload, self.compress_level)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(self._HEADER.pack(self._MAGIC, pickle.HIGHEST_PROTOCOL, len(payload)))
+                file.write(body)
+            with self._lock():
+                path = self._path(key)
+                try:
+                    replaced = os.stat(path).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+                self._account(self._HEADER.size + len(body) - replaced)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self._SUFFIX):
+                    with contextlib.suppress(FileNotFoundError):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _read_total(self):
+        try:
+            with open(os.path.join(self.directory, self._SIZE_FILE)) as file:
+                return int(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_total(self, total):
+        with contextlib.suppress(OSError):
+            with open(os.path.join(self.directory, self._SIZE_FILE), "w") as file:
+                file.write(str(total))
+
+    def _account(self, delta):
+        # Called with the lock held. A missing or unreadable total, or one over
+        # the limit, is recomputed from a directory scan, so drift (entries
+        # deleted by hand, a crash mid-write) corrects itself.
+        total = self._read_total()
+        if total is None or total + delta > self.max_bytes:
+            total = self._evict()
+        else:
+            total += delta
+        self._write_total(total)
+
+    def _evict(self):
+        # Called with the lock held; returns the size left on disk.
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return total
+        target = self.max_bytes * self._LOW_WATER
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                self.stats.evictions += 1
+            total -= size
+        return total
+
+    @contextlib.contextmanager
+    def _lock(self):
+        # One writer at a time across processes, so the running total stays
+        # right and two evictors do not both delete down to the limit and
+        # empty the cache between them.
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def clear(self):
+        with self._lock():
+            for _, _, path in self._entries():
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+            self._write_total(0)
+
+# 3. Decorator
+def disk_cached(cache, capture_output=False, depends=()):
+    """
+    Memoizes a function in a DiskCache across processes and restarts. With
+    capture_output, whatever the function printed is stored and re-printed on
+    a hit. The cache is available as wrapper.cache.
+    """
+    def decorator(func):
+        fingerprint = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal fingerprint
+            if fingerprint is None:
+                fingerprint = code_fingerprint(func, depends)
+            key = make_key(fingerprint, args, kwargs)
+            hit, entry = cache.get(key)
+            if hit:
+                value, output = entry
+                if output:
+                    sys.stdout.write(output)
+                return value
+            if capture_output:
+                buffer = io.StringIO()
+                with contextlib.redirect_stdout(buffer):
+                    value = func(*args, **kwargs)
+                output = buffer.getvalue()
+                sys.stdout.write(output)
+            else:
+                value, output = func(*args, **kwargs), ""
+            try:
+                cache.put(key, (value, output))
+            except (OSError, pickle.PicklingError, TypeError, AttributeError):
+                pass  # unpicklable result or a full/read-only disk; still return it
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+if __name__ == "__main__":
+    import time
+
+    cache = DiskCache(os.path.join(tempfile.gettempdir(), "snake_den_cache"), max_bytes=64 * 2**20)
+
+    @disk_cached(cache)
+    def slow_prefix_sum(values):
+        time.sleep(0.5)
+        total, out = 0, array("q")
+        for v in values:
+            total += v
+            out.append(total)
+        return out
+
+    data = array("q", range(100_000))
+    for attempt in ("first", "second"):
+        start = time.perf_counter()
+        slow_prefix_sum(data)
+        print(f"{attempt} call: {time.perf_counter() - start:.3f}s")
+    print(cache.stats, f"| {cache.size()} bytes on disk")
+    print("Run again: the first call is a hit too, since the cache outlives the process.")
@@ -0,0 +1,263 @@
+# Space-Optimized Dynamic Programming
+#
+# Pattern 15 in lc_patterns.py is top-down: recursion plus a memo dict. That is
+# the easiest way to write a DP, but on long inputs it holds every subproblem in
+# memory and can hit the recursion limit. Most table DPs only ever look one row
+# back, so the bottom-up versions here keep two rows (or one) instead of the
+# whole n x m table:
+#
+#   - edit distance, LCS length: O(min(n, m)) memory.
+#   - 0/1 knapsack: O(capacity) memory.
+#
+# When the actual alignment, subsequence or item selection is needed, the
+# Hirschberg versions recover it without the full table: split the problem in
+# half, run the rolling DP forwards over one half and backwards over the other,
+# find where the optimal path crosses the middle, and recurse on the two parts.
+# Memory stays linear; time roughly doubles (or gains a log factor for knapsack).
+#
+# The *_numpy variants vectorize the inner loop. Knapsack rows vectorize
+# directly. Edit distance and LCS have a left-to-right dependency within a
+# row, so they sweep anti-diagonals instead: every cell on diagonal i + j = d
+# depends only on diagonals d - 1 and d - 2.
+
+# 1. Fibonacci, Bottom-Up
+def fibonacci(n):
+    """
+    Calculates the nth Fibonacci number keeping only the last two values.
+    """
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+# 2. Edit Distance
+def edit_distance(a, b):
+    """
+    Levenshtein distance with two rolling rows over the shorter input.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    return _edit_last_row(a, b)[-1]
+
+def _edit_last_row(a, b):
+    """
+    Last row of the edit-distance table: distances from all of a to each b[:j].
+    """
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, y in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (x != y))
+        prev = cur
+    return prev
+
+def _edit_alignment_small(a, b):
+    # Full table; only used when one side has at most one element.
+    n, m = len(a), len(b)
+    table = [[i + j if i == 0 or j == 0 else 0 for j in range(m + 1)] for i in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1,
+                              table[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+    ops, i, j = [], n, m
+    while i or j:
+        if i and j and table[i][j] == table[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            ops.append(("match" if a[i - 1] == b[j - 1] else "sub", a[i - 1], b[j - 1]))
+            i, j = i - 1, j - 1
+        elif i and table[i][j] == table[i - 1][j] + 1:
+            ops.append(("del", a[i - 1], None))
+            i -= 1
+        else:
+            ops.append(("ins", None, b[j - 1]))
+            j -= 1
+    ops.reverse()
+    return ops
+
+def edit_alignment(a, b):
+    """
+    An optimal alignment as a list of (op, x, y) with op in "match", "sub",
+    "del" (x from a removed) and "ins" (y from b inserted). Hirschberg: linear
+    memory.
+    """
+    if len(a) <= 1 or len(b) <= 1:
+        return _edit_alignment_small(a, b)
+    mid = len(a) // 2
+    left = _edit_last_row(a[:mid], b)
+    right = _edit_last_row(a[mid:][::-1], b[::-1])
+    m = len(b)
+    split = min(range(m + 1), key=lambda j: left[j] + right[m - j])
+    return edit_alignment(a[:mid], b[:split]) + edit_alignment(a[mid:], b[split:])
+
+# 3. Longest Common Subsequence
+def lcs_length(a, b):
+    """
+    Length of the longest common subsequence with two rolling rows.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    return _lcs_last_row(a, b)[-1]
+
+def _lcs_last_row(a, b):
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0] * (len(b) + 1)
+        for j, y in enumerate(b, 1):
+            cur[j] = prev[j - 1] + 1 if x == y else max(prev[j], cur[j - 1])
+        prev = cur
+    return prev
+
+def lcs(a, b):
+    """
+    One longest common subsequence, as a list. Hirschberg: linear memory.
+    """
+    if not a or not b:
+        return []
+    if len(a) == 1:
+        return [a[0]] if a[0] in b else []
+    mid = len(a) // 2
+    left = _lcs_last_row(a[:mid], b)
+    right = _lcs_last_row(a[mid:][::-1], b[::-1])
+    m = len(b)
+    split = max(range(m + 1), key=lambda j: left[j] + right[m - j])
+    return lcs(a[:mid], b[:split]) + lcs(a[mid:], b[split:])
+
+# 4. 0/1 Knapsack
+def knapsack_01(weights, values, capacity):
+    """
+    Best total value within capacity, one row of size capacity + 1. Iterating
+    capacity downwards makes each item usable at most once.
+    """
+    best = [0] * (capacity + 1)
+    for w, v in zip(weights, values):
+        for c in range(capacity, w - 1, -1):
+            candidate = best[c - w] + v
+            if candidate > best[c]:
+                best[c] = candidate
+    return best[capacity]
+
+def _knapsack_row(items, capacity):
+    best = [0] * (capacity + 1)
+    for _, w, v in items:
+        for c in range(capacity, w - 1, -1):
+            candidate = best[c - w] + v
+            if candidate > best[c]:
+                best[c] = candidate
+    return best
+
+def _knapsack_select(items, capacity):
+    if not items:
+        return []
+    if len(items) == 1:
+        index, w, v = items[0]
+        return [index] if w <= capacity and v > 0 else []
+    mid = len(items) // 2
+    left = _knapsack_row(items[:mid], capacity)
+    right = _knapsack_row(items[mid:], capacity)
+    split = max(range(capacity + 1), key=lambda c: left[c] + right[capacity - c])
+    return (_knapsack_select(items[:mid], split)
+            + _knapsack_select(items[mid:], capacity - split))
+
+def knapsack_01_items(weights, values, capacity):
+    """
+    (best value, chosen item indices) in O(capacity) memory per recursion level,
+    by splitting the items in half and the capacity where the halves meet.
+    """
+    items = [(i, w, v) for i, (w, v) in enumerate(zip(weights, values))]
+    chosen = _knapsack_select(items, capacity)
+    return sum(values[i] for i in chosen), chosen
+
+# 5. NumPy Variants
+def _codes(a, b):
+    import numpy as np
+
+    if isinstance(a, str) and isinstance(b, str):
+        return (np.frombuffer(a.encode("utf-32-le"), dtype=np.uint32),
+                np.frombuffer(b.encode("utf-32-le"), dtype=np.uint32))
+    ids = {}
+    return (np.array([ids.setdefault(x, len(ids)) for x in a], dtype=np.int64),
+            np.array([ids.setdefault(y, len(ids)) for y in b], dtype=np.int64))
+
+def edit_distance_numpy(a, b):
+    """
+    edit_distance, sweeping anti-diagonals with NumPy. Each diagonal buffer is
+    indexed by row i and sized by the shorter input.
+    """
+    import numpy as np
+
+    if len(a) > len(b):
+        a, b = b, a
+    A, B = _codes(a, b)
+    n, m = len(A), len(B)
+    if n == 0:
+        return m
+    prev2 = np.zeros(n + 1, dtype=np.int64)
+    prev1 = np.zeros(n + 1, dtype=np.int64)
+    cur = np.zeros(n + 1, dtype=np.int64)
+    prev1[0] = prev1[1] = 1  # diagonal d = 1: cells (0, 1) and (1, 0)
+    for d in range(2, n + m + 1):
+        lo, hi = max(1, d - m), min(n, d - 1)
+        if lo <= hi:
+            i = np.arange(lo, hi + 1)
+            cost = A[i - 1] != B[d - i - 1]
+            cur[lo:hi + 1] = np.minimum(
+                np.minimum(prev1[lo - 1:hi], prev1[lo:hi + 1]) + 1,
+                prev2[lo - 1:hi] + cost,
+            )
+        if d <= m:
+            cur[0] = d
+        if d <= n:
+            cur[d] = d
+        prev2, prev1, cur = prev1, cur, prev2
+    return int(prev1[n])
+
+def lcs_length_numpy(a, b):
+    """
+    lcs_length, sweeping anti-diagonals with NumPy.
+    """
+    import numpy as np
+
+    if len(a) > len(b):
+        a, b = b, a
+    A, B = _codes(a, b)
+    n, m = len(A), len(B)
+    if n == 0:
+        return 0
+    prev2 = np.zeros(n + 1, dtype=np.int64)
+    prev1 = np.zeros(n + 1, dtype=np.int64)
+    cur = np.zeros(n + 1, dtype=np.int64)
+    for d in range(2, n + m + 1):
+        lo, hi = max(1, d - m), min(n, d - 1)
+        if lo <= hi:
+            i = np.arange(lo, hi + 1)
+            equal = A[i - 1] == B[d - i - 1]
+            cur[lo:hi + 1] = np.where(
+                equal,
+                prev2[lo - 1:hi] + 1,
+                np.maximum(prev1[lo - 1:hi], prev1[lo:hi + 1]),
+            )
+        cur[0] = 0
+        if d <= n:
+            cur[d] = 0
+        prev2, prev1, cur = prev1, cur, prev2
+    return int(prev1[n])
+
+def knapsack_01_numpy(weights, values, capacity):
+    """
+    knapsack_01 with each item's row update as one array operation. The
+    right-hand side is evaluated from the old row before assignment, which
+    is what keeps every item 0/1.
+    """
+    import numpy as np
+
+    best = np.zeros(capacity + 1, dtype=np.int64)
+    for w, v in zip(weights, values):
+        if w <= capacity:
+            best[w:] = np.maximum(best[w:], best[:capacity + 1 - w] + v)
+    return int(best[capacity])
+
+if __name__ == "__main__":
+    print("Fibonacci(90):", fibonacci(90))
+    print("Edit distance kitten -> sitting:", edit_distance("kitten", "sitting"))
+    print("Alignment:", edit_alignment("kitten", "sitting"))
+    print("LCS of ABCBDAB, BDCABA:", "".join(lcs("ABCBDAB", "BDCABA")))
+    print("Knapsack:", knapsack_01_items([1, 3, 4, 5], [1, 4, 5, 7], 7))
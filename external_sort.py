@@ -0,0 +1,150 @@
+# External Merge Sort for Larger-Than-Memory Data
+#
+# lc_patterns.merge_intervals begins with intervals.sort(...), which needs the
+# whole list in RAM. For interval and event files of 100 GB that is not an
+# option. An external sort keeps memory fixed no matter the input size:
+#
+#   1. Run generation: read run_size records at a time, sort each batch (in a
+#      process pool, several batches at once), and write it to a temp file as
+#      packed fixed-width binary records - 16 bytes for an (int64, int64)
+#      interval, against roughly 120 bytes as a Python list of two ints.
+#   2. Merge: open every run as a buffered stream and heapq.merge them; each
+#      run contributes one record at a time, so memory is O(runs), not O(n).
+#      With more than fan_in runs, merge in passes.
+#
+# Records are tuples described by a struct format ("<qq" by default) and are
+# ordered as tuples, unless a key function is given.
+
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+DEFAULT_FORMAT = "<qq"
+READ_SIZE = 1 << 20
+
+# 1. Binary Record Files
+def write_records(path, records, fmt=DEFAULT_FORMAT):
+    """
+    Packs records into path; returns how many were written.
+    """
+    packer = struct.Struct(fmt)
+    count = 0
+    with open(path, "wb", buffering=READ_SIZE) as file:
+        for record in records:
+            file.write(packer.pack(*record))
+            count += 1
+    return count
+
+def read_records(path, fmt=DEFAULT_FORMAT, read_size=READ_SIZE):
+    """
+    Streams records back from a packed file, one buffered block at a time.
+    """
+    unpacker = struct.Struct(fmt)
+    block = max(1, read_size // unpacker.size) * unpacker.size
+    with open(path, "rb") as file:
+        while chunk := file.read(block):
+            yield from unpacker.iter_unpack(chunk)
+
+# 2. Run Generation
+def _sort_run(records, fmt, key, directory):
+    records.sort(key=key)
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    os.close(fd)
+    write_records(path, records, fmt)
+    return path
+
+def make_runs(records, directory, fmt=DEFAULT_FORMAT, run_size=1_000_000, key=None, workers=1):
+    """
+    Splits records into sorted run files in directory; returns their paths.
+    At most `workers` runs are in flight at once, which bounds memory at about
+    (workers + 1) * run_size records.
+    """
+    records = iter(records)
+    paths = []
+    if workers <= 1:
+        while batch := list(islice(records, run_size)):
+            paths.append(_sort_run(batch, fmt, key, directory))
+        return paths
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while batch := list(islice(records, run_size)):
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                paths.extend(f.result() for f in done)
+            pending.add(pool.submit(_sort_run, batch, fmt, key, directory))
+        paths.extend(f.result() for f in pending)
+    return paths
+
+# 3. K-Way Merge
+def merge_runs(paths, fmt=DEFAULT_FORMAT, key=None, read_size=READ_SIZE):
+    """
+    Lazily merges sorted run files with a heap.
+    """
+    return heapq.merge(*(read_records(p, fmt, read_size) for p in paths), key=key)
+
+def _reduce_runs(paths, directory, fmt, key, fan_in):
+    # Merge groups of fan_in runs into bigger runs until one pass can finish.
+    while len(paths) > fan_in:
+        merged = []
+        for i in range(0, len(paths), fan_in):
+            group = paths[i:i + fan_in]
+            fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+            os.close(fd)
+            write_records(path, merge_runs(group, fmt, key), fmt)
+            for old in group:
+                os.remove(old)
+            merged.append(path)
+        paths = merged
+    return paths
+
+# 4. Putting it Together
+def external_sort(records, fmt=DEFAULT_FORMAT, run_size=1_000_000, key=None,
+                  workers=None, fan_in=64, temp_dir=None):
+    """
+    Yields records in sorted order using bounded memory. Temp files live in a
+    private directory that is removed when the generator finishes or is closed.
+    key must be picklable (module-level) when workers > 1.
+    """
+    workers = workers or os.cpu_count() or 1
+    directory = tempfile.mkdtemp(prefix="extsort-", dir=temp_dir)
+    try:
+        paths = make_runs(records, directory, fmt, run_size, key, workers)
+        paths = _reduce_runs(paths, directory, fmt, key, fan_in)
+        yield from merge_runs(paths, fmt, key)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def sort_file(src, dst, fmt=DEFAULT_FORMAT, **kwargs):
+    """
+    Sorts a packed record file into another; returns the record count.
+    """
+    return write_records(dst, external_sort(read_records(src, fmt), fmt, **kwargs), fmt)
+
+def merge_intervals_stream(sorted_intervals):
+    """
+    merge_intervals for a stream already sorted by start: yields merged
+    (start, end) tuples while holding only the interval being built.
+    """
+    current = None
+    for start, end in sorted_intervals:
+        if current is None:
+            current = [start, end]
+        elif current[1] < start:
+            yield tuple(current)
+            current = [start, end]
+        else:
+            current[1] = max(current[1], end)
+    if current is not None:
+        yield tuple(current)
+
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(0)
+    intervals = ((s, s + rng.randrange(1, 50)) for s in (rng.randrange(10_000_000) for _ in range(500_000)))
+    merged = sum(1 for _ in merge_intervals_stream(external_sort(intervals, run_size=100_000)))
+    print("Merged intervals:", merged)
@@ -0,0 +1,153 @@
+# Headless, Downsampled Plotting
+#
+# module_13 in python_tour.py imports matplotlib.pyplot at the top and plots every
+# point. Importing pyplot triggers interactive backend selection (slow, and it can
+# fail on a server with no display), and drawing 10^7 points produces a picture no
+# different from drawing a few thousand. This module forces the Agg backend, only
+# imports matplotlib when a chart is actually drawn, downsamples before drawing,
+# and spreads batches of charts across worker processes.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# 1. Lazy, Non-Interactive Matplotlib
+_pyplot = None
+
+def get_pyplot():
+    """
+    Imports matplotlib.pyplot on first use with the non-interactive Agg backend.
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+
+        matplotlib.use("Agg", force=True)
+        import matplotlib.pyplot as plt
+
+        _pyplot = plt
+    return _pyplot
+
+# 2. Downsampling
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling. Keeps the first and last points
+    and, from each of n_out - 2 buckets in between, the point that forms the
+    largest triangle with the previously kept point and the next bucket's mean.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # Bucket boundaries for the n - 2 interior points.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_x = x[edges[b + 1]:edges[b + 2]].mean()
+            next_y = y[edges[b + 1]:edges[b + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle area; the constant factor does not change the argmax.
+        area = np.abs(
+            (x[prev] - next_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (next_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        keep[b + 1] = prev
+    return x[keep], y[keep]
+
+def minmax(x, y, n_buckets):
+    """
+    Min/max-per-pixel downsampling. Keeps the lowest and highest point of each
+    bucket, in x order, so spikes survive exactly. Returns at most 2 * n_buckets
+    points. Fully vectorized.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if 2 * n_buckets >= n:
+        return x, y
+    size = n // n_buckets
+    usable = size * n_buckets
+    blocks = y[:usable].reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lo = offsets + blocks.argmin(axis=1)
+    hi = offsets + blocks.argmax(axis=1)
+    keep = np.sort(np.concatenate([lo, hi, np.arange(usable, n)]))
+    keep = keep[np.concatenate(([True], keep[1:] != keep[:-1]))]
+    return x[keep], y[keep]
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax}
+
+# 3. Drawing a Chart
+def plot_series(x, y, path, title="", xlabel="x-axis", ylabel="y-axis",
+                method="lttb", width_px=1200, height_px=600, dpi=100, **line_kwargs):
+    """
+    Downsamples (x, y) to roughly one point per horizontal pixel and saves a line
+    chart to path. Returns the number of points actually drawn.
+    """
+    if method is not None:
+        target = width_px if method == "lttb" else width_px // 2
+        x, y = DOWNSAMPLERS[method](x, y, target)
+    plt = get_pyplot()
+    fig, ax = plt.subplots(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+    try:
+        ax.plot(x, y, **line_kwargs)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        fig.savefig(path)
+    finally:
+        # Without an explicit close, pyplot keeps every figure alive.
+        plt.close(fig)
+    return len(x)
+
+def _plot_spec(spec):
+    spec = dict(spec)
+    return plot_series(spec.pop("x"), spec.pop("y"), spec.pop("path"), **spec)
+
+# 4. Rendering Many Charts in Parallel
+def render_many(specs, workers=None):
+    """
+    Renders a batch of charts across worker processes. Each spec is a dict of
+    plot_series keyword arguments and must include x, y and path. Returns the
+    drawn point counts in spec order.
+
+    Tip: downsample in the parent before submitting when the raw series are
+    huge, since every spec is pickled across to a worker.
+    """
+    specs = list(specs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(specs) == 1:
+        return [_plot_spec(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_plot_spec, specs, chunksize=max(1, len(specs) // (4 * workers))))
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    # module_13's chart, and then a batch of 10^6-point ones.
+    with tempfile.TemporaryDirectory() as tmp:
+        x = [0, 1, 2, 3, 4]
+        plot_series(x, [i ** 2 for i in x], os.path.join(tmp, "plot.png"),
+                    title="Sample Line Plot", marker='o')
+
+        rng = np.random.default_rng(0)
+        xs = np.arange(1_000_000)
+        specs = [
+            {"x": xs, "y": rng.standard_normal(len(xs)).cumsum(),
+             "path": os.path.join(tmp, f"walk_{i}.png"), "title": f"Walk {i}"}
+            for i in range(8)
+        ]
+        start = time.perf_counter()
+        drawn = render_many(specs)
+        print(f"Rendered {len(specs)} charts ({drawn[0]} points each) "
+              f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,297 @@
+# Topological Order and Strongly Connected Components
+#
+# lc_patterns.dfs and lc_patterns.bfs answer "what can I reach?". Dependency
+# resolution also needs "in what order?" and "where are the cycles?". Both
+# routines here run without recursion, so a chain of hundreds of thousands of
+# nodes cannot overflow the stack the way a recursive DFS (or the recursive
+# dfs in lc_patterns) would.
+#
+# The dict-of-lists graph is first packed into compact CSR form: node i's
+# successors are targets[offsets[i]:offsets[i + 1]], with both arrays stored
+# as typed array('q') rather than lists of boxed ints. Every result comes back
+# in the same integer-ID space, with .nodes to map IDs back to the originals.
+
+from array import array
+from collections import namedtuple
+
+class CycleError(ValueError):
+    """
+    Raised by topological_sort; .cycle holds one offending cycle as a list of
+    nodes, with the first node repeated at the end.
+    """
+    def __init__(self, cycle):
+        super().__init__(f"graph has a cycle: {' -> '.join(map(str, cycle))}")
+        self.cycle = cycle
+
+# 1. Compact Graphs
+class CompactGraph:
+    """
+    A directed graph in CSR form over integer IDs 0..n-1.
+    """
+    def __init__(self, nodes, offsets, targets):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_adjacency(cls, graph):
+        """
+        Packs a dict-of-lists graph. Nodes that only appear as targets are
+        included too.
+        """
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        for neighbors in graph.values():
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = len(nodes)
+                    nodes.append(neighbor)
+        offsets = array("q", [0])
+        targets = array("q")
+        for node in nodes:
+            targets.extend(index[neighbor] for neighbor in graph.get(node, ()))
+            offsets.append(len(targets))
+        return cls(nodes, offsets, targets)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def reverse(self):
+        n = len(self.nodes)
+        counts = array("q", bytes(8 * (n + 1)))
+        for target in self.targets:
+            counts[target + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        fill = array("q", counts)
+        targets = array("q", bytes(8 * len(self.targets)))
+        offsets, forward = self.offsets, self.targets
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = forward[e]
+                targets[fill[v]] = u
+                fill[v] += 1
+        return CompactGraph(self.nodes, counts, targets)
+
+def _compact(graph):
+    return graph if isinstance(graph, CompactGraph) else CompactGraph.from_adjacency(graph)
+
+# 2. Kahn's Topological Sort
+def kahn_order(graph):
+    """
+    Returns (order, cycle). order lists node IDs so every edge points forward;
+    if the graph has a cycle, order covers only the acyclic part and cycle is
+    one cycle as a list of IDs (first repeated at the end), else None.
+    """
+    g = _compact(graph)
+    n, offsets, targets = len(g), g.offsets, g.targets
+    indegree = array("q", bytes(8 * n))
+    for v in targets:
+        indegree[v] += 1
+    # The output array doubles as the FIFO queue: order[head:] is pending.
+    order = array("q", (u for u in range(n) if indegree[u] == 0))
+    head = 0
+    while head < len(order):
+        u = order[head]
+        head += 1
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                order.append(v)
+    if len(order) == n:
+        return order, None
+    return order, _find_cycle(g, indegree)
+
+def _find_cycle(g, indegree):
+    # Every node left with indegree > 0 has a predecessor that is also left,
+    # so walking predecessors inside that set must eventually repeat a node.
+    reverse = g.reverse()
+    start = next(u for u in range(len(g)) if indegree[u] > 0)
+    seen = {}
+    path = []
+    u = start
+    while u not in seen:
+        seen[u] = len(path)
+        path.append(u)
+        u = next(
+            reverse.targets[e]
+            for e in range(reverse.offsets[u], reverse.offsets[u + 1])
+            if indegree[reverse.targets[e]] > 0
+        )
+    cycle = path[seen[u]:]
+    cycle.reverse()  # predecessor walk -> successor order
+    return cycle + [cycle[0]]
+
+def topological_sort(graph):
+    """
+    Returns the nodes of a dict-of-lists graph in dependency order (every node
+    before its successors). Raises CycleError if there is none.
+    """
+    g = _compact(graph)
+    order, cycle = kahn_order(g)
+    if cycle is not None:
+        raise CycleError([g.nodes[u] for u in cycle])
+    return [g.nodes[u] for u in order]
+
+# 3. Strongly Connected Components
+SCCResult = namedtuple("SCCResult", ["nodes", "component", "count", "dag"])
+SCCResult.__doc__ = """
+component[i] is node i's component ID; IDs are in topological order of the
+condensation (edges between components go from lower to higher IDs). dag is
+the condensation as a CompactGraph whose nodes are component IDs.
+"""
+
+def tarjan_scc(graph):
+    """
+    Iterative Tarjan: one DFS, with an explicit stack of (node, next edge).
+    """
+    g = _compact(graph)
+    n, offsets, targets = len(g), g.offsets, g.targets
+    UNVISITED = -1
+    index = array("q", [UNVISITED]) * n
+    lowlink = array("q", bytes(8 * n))
+    component = array("q", [UNVISITED]) * n
+    on_stack = bytearray(n)
+    scc_stack = array("q")
+    call_stack = []  # [node, position in its edge list]
+    counter = count = 0
+
+    for root in range(n):
+        if index[root] != UNVISITED:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        scc_stack.append(root)
+        on_stack[root] = 1
+        call_stack.append([root, offsets[root]])
+        while call_stack:
+            frame = call_stack[-1]
+            u, e = frame
+            if e < offsets[u + 1]:
+                frame[1] = e + 1
+                v = targets[e]
+                if index[v] == UNVISITED:
+                    index[v] = lowlink[v] = counter
+                    counter += 1
+                    scc_stack.append(v)
+                    on_stack[v] = 1
+                    call_stack.append([v, offsets[v]])
+                elif on_stack[v] and index[v] < lowlink[u]:
+                    lowlink[u] = index[v]
+                continue
+            # All of u's edges are done: "return" to the parent.
+            call_stack.pop()
+            if call_stack:
+                parent = call_stack[-1][0]
+                if lowlink[u] < lowlink[parent]:
+                    lowlink[parent] = lowlink[u]
+            if lowlink[u] == index[u]:
+                while True:
+                    w = scc_stack.pop()
+                    on_stack[w] = 0
+                    component[w] = count
+                    if w == u:
+                        break
+                count += 1
+
+    # Tarjan finishes sink components first; flip to topological order.
+    for i in range(n):
+        component[i] = count - 1 - component[i]
+    return SCCResult(g.nodes, component, count, _condense(g, component, count))
+
+def kosaraju_scc(graph):
+    """
+    Iterative Kosaraju: finish order on the graph, then sweep the reverse graph
+    in reverse finish order. Two passes, but simpler bookkeeping than Tarjan.
+    """
+    g = _compact(graph)
+    n, offsets, targets = len(g), g.offsets, g.targets
+    visited = bytearray(n)
+    finished = array("q")
+    for root in range(n):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        stack = [[root, offsets[root]]]
+        while stack:
+            frame = stack[-1]
+            u, e = frame
+            if e < offsets[u + 1]:
+                frame[1] = e + 1
+                v = targets[e]
+                if not visited[v]:
+                    visited[v] = 1
+                    stack.append([v, offsets[v]])
+            else:
+                stack.pop()
+                finished.append(u)
+
+    reverse = g.reverse()
+    component = array("q", [-1]) * n
+    count = 0
+    for root in reversed(finished):
+        if component[root] != -1:
+            continue
+        component[root] = count
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for e in range(reverse.offsets[u], reverse.offsets[u + 1]):
+                v = reverse.targets[e]
+                if component[v] == -1:
+                    component[v] = count
+                    stack.append(v)
+        count += 1
+    return SCCResult(g.nodes, component, count, _condense(g, component, count))
+
+def _condense(g, component, count):
+    """
+    Builds the condensation DAG in CSR form with duplicate edges removed.
+    """
+    n, offsets, targets = len(g), g.offsets, g.targets
+    # Counting sort of nodes by component, so each component's edges are
+    # gathered together.
+    starts = array("q", bytes(8 * (count + 1)))
+    for c in component:
+        starts[c + 1] += 1
+    for c in range(count):
+        starts[c + 1] += starts[c]
+    fill = array("q", starts)
+    members = array("q", bytes(8 * n))
+    for u in range(n):
+        members[fill[component[u]]] = u
+        fill[component[u]] += 1
+
+    last_seen = array("q", [-1]) * count
+    dag_offsets = array("q", [0])
+    dag_targets = array("q")
+    for c in range(count):
+        for m in range(starts[c], starts[c + 1]):
+            u = members[m]
+            for e in range(offsets[u], offsets[u + 1]):
+                d = component[targets[e]]
+                if d != c and last_seen[d] != c:
+                    last_seen[d] = c
+                    dag_targets.append(d)
+        dag_offsets.append(len(dag_targets))
+    return CompactGraph(list(range(count)), dag_offsets, dag_targets)
+
+if __name__ == "__main__":
+    deps = {'app': ['lib', 'utils'], 'lib': ['utils', 'core'], 'utils': ['core'], 'core': []}
+    print("Build order (dependencies last):", topological_sort(deps))
+    try:
+        topological_sort({'a': ['b'], 'b': ['c'], 'c': ['a']})
+    except CycleError as error:
+        print("Cycle:", error.cycle)
+
+    graph = {1: [2], 2: [3], 3: [1, 4], 4: [5], 5: [6], 6: [4, 7], 7: []}
+    result = tarjan_scc(graph)
+    print("Components:", dict(zip(result.nodes, result.component)))
+    print("Condensation edges:", [
+        (c, list(result.dag.targets[result.dag.offsets[c]:result.dag.offsets[c + 1]]))
+        for c in range(result.count)
+    ])
+
+    chain = {i: [i + 1] for i in range(200_000)}
+    print("Deep chain SCCs:", tarjan_scc(chain).count)
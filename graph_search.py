@@ -0,0 +1,134 @@
+# Point-to-Point Graph Search
+#
+# lc_patterns.bfs explores the whole reachable component and returns the visited
+# set. When all we want is the distance (and a path) between two nodes, most of
+# that work is wasted. These routines take the same dict-of-lists adjacency and
+# stop as soon as the answer is known:
+#
+#   - bidirectional_bfs: grows one BFS from the source and one from the target,
+#     always expanding the smaller frontier, until they touch. On graphs where
+#     the ball of radius r grows like b^r (social graphs), two balls of radius
+#     d/2 are roughly the square root of one ball of radius d.
+#   - zero_one_bfs: shortest paths when every edge weighs 0 or 1. A deque
+#     replaces Dijkstra's heap: 0-edges go to the front, 1-edges to the back.
+#
+# Both return (path, length), or (None, -1) when the target is unreachable.
+
+from collections import deque
+
+# 1. Helpers
+def reverse_graph(graph):
+    """
+    Reverses every edge of a directed dict-of-lists graph.
+    """
+    reverse = {node: [] for node in graph}
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            reverse.setdefault(neighbor, []).append(node)
+    return reverse
+
+def _walk_back(parents, node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    return path
+
+# 2. Bidirectional BFS
+def bidirectional_bfs(graph, start, goal, directed=False, reverse=None):
+    """
+    Shortest unweighted path from start to goal, searching from both ends.
+
+    For a directed graph pass directed=True (the reverse adjacency is built
+    once) or a precomputed reverse= graph to reuse across queries.
+    """
+    if start == goal:
+        return [start], 0
+    if directed and reverse is None:
+        reverse = reverse_graph(graph)
+    backward_graph = reverse if reverse is not None else graph
+
+    # Per side: parent pointers (which double as the visited set), distances,
+    # and the current frontier.
+    parents = ({start: None}, {goal: None})
+    dists = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+    adjacency = (graph, backward_graph)
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        other = 1 - side
+        own_parents, own_dists = parents[side], dists[side]
+        other_dists = dists[other]
+        best, meeting = None, None
+        next_frontier = []
+        for node in frontiers[side]:
+            depth = own_dists[node] + 1
+            for neighbor in adjacency[side].get(node, ()):
+                if neighbor in own_parents:
+                    continue
+                own_parents[neighbor] = node
+                own_dists[neighbor] = depth
+                next_frontier.append(neighbor)
+                # Finish the whole level before stopping: a later node on this
+                # level can meet the other side at a smaller total distance.
+                if neighbor in other_dists:
+                    total = depth + other_dists[neighbor]
+                    if best is None or total < best:
+                        best, meeting = total, neighbor
+        if meeting is not None:
+            forward = _walk_back(parents[0], meeting)
+            forward.reverse()
+            backward = _walk_back(parents[1], meeting)
+            return forward + backward[1:], best
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    return None, -1
+
+# 3. 0-1 BFS
+def zero_one_bfs(graph, start, goal, weight=None):
+    """
+    Shortest path when every edge weight is 0 or 1.
+
+    graph is dict-of-lists. Either the lists hold (neighbor, weight) pairs, or
+    they hold plain neighbors and weight(node, neighbor) gives each edge's cost.
+    """
+    dist = {start: 0}
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == goal:
+            path = _walk_back(parents, goal)
+            path.reverse()
+            return path, dist[goal]
+        base = dist[node]
+        for entry in graph.get(node, ()):
+            if weight is None:
+                neighbor, cost = entry
+            else:
+                neighbor, cost = entry, weight(node, entry)
+            candidate = base + cost
+            if candidate < dist.get(neighbor, candidate + 1):
+                dist[neighbor] = candidate
+                parents[neighbor] = node
+                if cost == 0:
+                    queue.appendleft(neighbor)
+                elif cost == 1:
+                    queue.append(neighbor)
+                else:
+                    raise ValueError(f"edge {node!r} -> {neighbor!r} has weight {cost}, expected 0 or 1")
+    return None, -1
+
+if __name__ == "__main__":
+    graph = {
+        'A': ['B', 'C'], 'B': ['A', 'D', 'E'], 'C': ['A', 'F'],
+        'D': ['B'], 'E': ['B', 'F'], 'F': ['C', 'E'],
+    }
+    print("Bidirectional A -> F:", bidirectional_bfs(graph, 'A', 'F'))
+    print("Directed A -> D:", bidirectional_bfs({'A': ['B'], 'B': ['D'], 'D': []}, 'A', 'D', directed=True))
+
+    weighted = {
+        'A': [('B', 1), ('C', 0)], 'B': [('D', 0)],
+        'C': [('E', 1)], 'E': [('D', 0)], 'D': [],
+    }
+    print("0-1 BFS A -> D:", zero_one_bfs(weighted, 'A', 'D'))
@@ -0,0 +1,187 @@
+# Grid Shortest Paths with Whole-Frontier Operations
+#
+# lc_patterns.count_islands walks a grid one cell at a time with a recursive
+# DFS. That style works for counting small islands, but a BFS over a large
+# occupancy grid done the same way pays Python overhead on every cell. Here the
+# grid is a NumPy boolean array (True = passable), and each BFS step works on
+# the whole frontier at once:
+#
+#   next_frontier = shift(frontier, every direction) & passable & ~visited
+#
+# so one step costs a few vectorized array operations regardless of how many
+# cells the frontier holds. The result is a distance field: every cell's step
+# count from the nearest source, or -1 if unreachable. Multi-source spreading
+# ("rotting oranges") is the same call with many sources.
+#
+# For one pair of cells on a grid with per-cell costs, astar() runs A* with an
+# admissible Manhattan (4-connected) or octile (8-connected) heuristic.
+
+import heapq
+import math
+
+import numpy as np
+
+OFFSETS_4 = ((-1, 0), (1, 0), (0, -1), (0, 1))
+OFFSETS_8 = OFFSETS_4 + ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+def _offsets(connectivity):
+    if connectivity == 4:
+        return OFFSETS_4
+    if connectivity == 8:
+        return OFFSETS_8
+    raise ValueError("connectivity must be 4 or 8")
+
+def _slices(d, n):
+    # (destination, source) slices that move an axis of length n by d cells.
+    if d >= 0:
+        return slice(d, n), slice(0, n - d)
+    return slice(0, n + d), slice(-d, n)
+
+# 1. Frontier Dilation
+def dilate(frontier, connectivity=4, out=None):
+    """
+    Every cell that is a neighbour of a frontier cell (the frontier included).
+    """
+    if out is None:
+        out = np.empty_like(frontier)
+    out[...] = frontier
+    h, w = frontier.shape
+    for dy, dx in _offsets(connectivity):
+        ys_dst, ys_src = _slices(dy, h)
+        xs_dst, xs_src = _slices(dx, w)
+        out[ys_dst, xs_dst] |= frontier[ys_src, xs_src]
+    return out
+
+# 2. Breadth-First Distance Fields
+def distance_field(passable, sources, connectivity=4, goal=None):
+    """
+    BFS step counts from the nearest source to every passable cell (-1 where
+    unreachable). sources is a boolean mask or a list of (row, col). With a
+    goal (row, col), stops as soon as the goal is reached.
+    """
+    passable = np.asarray(passable, dtype=bool)
+    if goal is not None:
+        goal = tuple(goal)  # a list would index rows, not one cell
+    if not isinstance(sources, np.ndarray):
+        mask = np.zeros(passable.shape, dtype=bool)
+        for cell in sources:
+            mask[tuple(cell)] = True
+        sources = mask
+    dist = np.full(passable.shape, -1, dtype=np.int32)
+    frontier = sources & passable
+    visited = frontier.copy()
+    dist[frontier] = 0
+    buffer = np.empty_like(frontier)
+    step = 0
+    while frontier.any():
+        if goal is not None and dist[goal] >= 0:
+            break
+        step += 1
+        frontier = dilate(frontier, connectivity, out=buffer) & passable & ~visited
+        visited |= frontier
+        dist[frontier] = step
+    return dist
+
+def shortest_path(passable, start, goal, connectivity=4):
+    """
+    (path as a list of (row, col), steps) between two cells, or (None, -1).
+    The path is read back from the distance field, walking downhill from goal.
+    """
+    start, goal = tuple(start), tuple(goal)
+    dist = distance_field(passable, [start], connectivity, goal=goal)
+    steps = int(dist[goal])
+    if steps < 0:
+        return None, -1
+    h, w = dist.shape
+    path = [goal]
+    r, c = goal
+    for d in range(steps - 1, -1, -1):
+        for dy, dx in _offsets(connectivity):
+            nr, nc = r + dy, c + dx
+            if 0 <= nr < h and 0 <= nc < w and dist[nr, nc] == d:
+                r, c = nr, nc
+                break
+        path.append((r, c))
+    path.reverse()
+    return path, steps
+
+def rotting_oranges(grid):
+    """
+    LeetCode "rotting oranges": 0 empty, 1 fresh, 2 rotten. Minutes until no
+    fresh orange remains, or -1 if some can never rot.
+    """
+    grid = np.asarray(grid)
+    fresh = grid == 1
+    dist = distance_field(grid > 0, grid == 2)
+    if (dist[fresh] < 0).any():
+        return -1
+    return int(dist[fresh].max()) if fresh.any() else 0
+
+# 3. A* on Weighted Grids
+def astar(cost, start, goal, connectivity=4):
+    """
+    Cheapest path where entering a cell costs cost[row, col] (NaN, inf or
+    negative means blocked; diagonal moves cost sqrt(2) times as much).
+    Returns (path, total cost) or (None, inf).
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    blocked = ~np.isfinite(cost) | (cost < 0)
+    h, w = cost.shape
+    start, goal = tuple(start), tuple(goal)
+    if blocked[start] or blocked[goal]:
+        return None, math.inf
+    open_costs = cost[~blocked]
+    floor = float(open_costs.min()) if open_costs.size else 0.0
+    offsets = _offsets(connectivity)
+    gr, gc = goal
+
+    def heuristic(r, c):
+        dy, dx = abs(r - gr), abs(c - gc)
+        if connectivity == 4:
+            return floor * (dy + dx)
+        return floor * (max(dy, dx) + (math.sqrt(2) - 1) * min(dy, dx))
+
+    best = {start: 0.0}
+    parents = {start: None}
+    heap = [(heuristic(*start), 0.0, start)]
+    cost_list = cost.tolist()  # plain floats: far faster to index per cell
+    blocked_list = blocked.tolist()
+    while heap:
+        _, g, cell = heapq.heappop(heap)
+        if cell == goal:
+            path = []
+            while cell is not None:
+                path.append(cell)
+                cell = parents[cell]
+            path.reverse()
+            return path, g
+        if g > best[cell]:
+            continue
+        r, c = cell
+        for dy, dx in offsets:
+            nr, nc = r + dy, c + dx
+            if not (0 <= nr < h and 0 <= nc < w) or blocked_list[nr][nc]:
+                continue
+            step = cost_list[nr][nc] * (math.sqrt(2) if dy and dx else 1.0)
+            candidate = g + step
+            neighbor = (nr, nc)
+            if candidate < best.get(neighbor, math.inf):
+                best[neighbor] = candidate
+                parents[neighbor] = cell
+                heapq.heappush(heap, (candidate + heuristic(nr, nc), candidate, neighbor))
+    return None, math.inf
+
+if __name__ == "__main__":
+    oranges = [[2, 1, 1],
+               [1, 1, 0],
+               [0, 1, 1]]
+    print("Rotting oranges:", rotting_oranges(oranges), "minutes")
+
+    rng = np.random.default_rng(0)
+    free = rng.random((1000, 1000)) > 0.3
+    free[0, 0] = free[-1, -1] = True
+    path, steps = shortest_path(free, (0, 0), (999, 999), connectivity=8)
+    print("Shortest path steps:", steps)
+
+    weights = rng.uniform(1, 10, (200, 200))
+    print("A* cost:", astar(weights, (0, 0), (199, 199))[1])
@@ -0,0 +1,189 @@
+# Hash Function Quality and Throughput Harness
+#
+# Hash.md argues about our table's hash function, hash(key) % self.size, in
+# prose: uniformity, avalanche, collision risk ("The Nails in the Coffin"). This
+# harness measures those properties instead, for any pluggable hash function
+# and realistic key sets, so a _hash for MyHashTable can be picked from data:
+#
+#   - chi_squared: bucket-count chi-squared against a uniform spread. Divided
+#     by (buckets - 1) it should sit near 1.0; much larger means clustering.
+#   - max_chain: the longest bucket, i.e. the worst-case lookup in a chained table,
+#     next to mean_chain (keys / buckets) for scale.
+#   - avalanche: average fraction of output bits that flip when one input bit
+#     flips. 0.5 is ideal; Python's hash() of an int is the int itself, so it
+#     scores near 0.
+#   - hashes_per_sec: raw throughput.
+
+import hashlib
+import time
+import uuid
+import zlib
+from collections import namedtuple
+
+MASK_64 = (1 << 64) - 1
+
+HashFunction = namedtuple("HashFunction", ["name", "func", "bits"])
+
+# 1. Candidate Hash Functions
+def _as_bytes(key):
+    if isinstance(key, str):
+        return key.encode("utf-8")
+    if isinstance(key, int):
+        return (key & MASK_64).to_bytes(8, "little")
+    return bytes(key)
+
+def python_hash(key):
+    """
+    What MyHashTable._hash uses today. Salted per process for str and bytes.
+    """
+    return hash(key) & MASK_64
+
+def fnv1a_64(key):
+    h = 0xCBF29CE484222325
+    for byte in _as_bytes(key):
+        h = ((h ^ byte) * 0x100000001B3) & MASK_64
+    return h
+
+def djb2(key):
+    h = 5381
+    for byte in _as_bytes(key):
+        h = (h * 33 + byte) & MASK_64
+    return h
+
+def crc32(key):
+    return zlib.crc32(_as_bytes(key))
+
+def blake2b_64(key):
+    return int.from_bytes(hashlib.blake2b(_as_bytes(key), digest_size=8).digest(), "little")
+
+def char_sum(key):
+    """
+    A deliberately poor hash (sum of bytes), to show what failing looks like.
+    """
+    return sum(_as_bytes(key))
+
+DEFAULT_FUNCTIONS = [
+    HashFunction("python_hash", python_hash, 64),
+    HashFunction("fnv1a_64", fnv1a_64, 64),
+    HashFunction("djb2", djb2, 64),
+    HashFunction("crc32", crc32, 32),
+    HashFunction("blake2b_64", blake2b_64, 64),
+    HashFunction("char_sum", char_sum, 64),
+]
+
+# 2. Key Sets
+def sequential_ints(n):
+    return list(range(n))
+
+def urls(n):
+    return [f"https://example.com/products/{i // 50}/items/{i}?ref=home" for i in range(n)]
+
+def uuids(n, seed=0):
+    import random
+
+    rng = random.Random(seed)
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(n)]
+
+def adversarial_ints(n, table_size):
+    """
+    Multiples of the table size: every key lands in bucket 0 under any hash
+    that is the identity on ints, which includes hash(key) % self.size.
+    """
+    return [i * table_size for i in range(n)]
+
+def key_sets(n, table_size):
+    return {
+        "sequential_ints": sequential_ints(n),
+        "urls": urls(n),
+        "uuids": uuids(n),
+        "adversarial_ints": adversarial_ints(n, table_size),
+    }
+
+# 3. Measurements
+def bucket_stats(hashes, table_size):
+    counts = [0] * table_size
+    for h in hashes:
+        counts[h % table_size] += 1
+    expected = len(hashes) / table_size
+    chi_squared = sum((c - expected) ** 2 for c in counts) / expected if expected else 0.0
+    return chi_squared, max(counts)
+
+def _flipped(key, bit):
+    if isinstance(key, int):
+        return key ^ (1 << bit)
+    if isinstance(key, str):
+        # Flip within the low 7 bits of a character so the result stays text.
+        index, bit = divmod(bit, 7)
+        return key[:index] + chr(ord(key[index]) ^ (1 << bit)) + key[index + 1:]
+    data = bytearray(key)
+    data[bit // 8] ^= 1 << (bit % 8)
+    return bytes(data)
+
+def _flippable_bits(key):
+    if isinstance(key, int):
+        return 64
+    if isinstance(key, str):
+        return 7 * min(len(key), 16)
+    return 8 * min(len(key), 16)
+
+def avalanche(func, bits, keys, sample=200):
+    """
+    Mean fraction of the output bits that change per single-bit input change.
+    """
+    mask = (1 << bits) - 1
+    changed = trials = 0
+    for key in keys[:sample]:
+        base = func(key) & mask
+        for bit in range(_flippable_bits(key)):
+            changed += bin(base ^ (func(_flipped(key, bit)) & mask)).count("1")
+            trials += 1
+    return changed / (trials * bits) if trials else 0.0
+
+def throughput(func, keys, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            func(key)
+        best = min(best, time.perf_counter() - start)
+    return len(keys) / best if best else float("inf")
+
+# 4. The Harness
+def evaluate(functions=DEFAULT_FUNCTIONS, n=20_000, table_sizes=(100, 1024, 10_007)):
+    """
+    Runs every function over every key set and table size. Returns a list of
+    result dicts, one per (function, key set, table size).
+    """
+    results = []
+    for table_size in table_sizes:
+        for set_name, keys in key_sets(n, table_size).items():
+            for fn in functions:
+                hashes = [fn.func(key) for key in keys]
+                chi_squared, max_chain = bucket_stats(hashes, table_size)
+                results.append({
+                    "function": fn.name,
+                    "keys": set_name,
+                    "table_size": table_size,
+                    "chi_squared": chi_squared,
+                    "chi_squared_ratio": chi_squared / (table_size - 1),
+                    "max_chain": max_chain,
+                    "mean_chain": n / table_size,
+                    "avalanche": avalanche(fn.func, fn.bits, keys),
+                    "hashes_per_sec": throughput(fn.func, keys),
+                })
+    return results
+
+def format_table(results):
+    header = (f"{'function':<12} {'keys':<17} {'size':>6} {'chi2/df':>9} "
+              f"{'max':>6} {'mean':>6} {'aval':>5} {'Mhash/s':>8}")
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['function']:<12} {r['keys']:<17} {r['table_size']:>6} "
+            f"{r['chi_squared_ratio']:>9.2f} {r['max_chain']:>6} {r['mean_chain']:>6.1f} "
+            f"{r['avalanche']:>5.2f} {r['hashes_per_sec'] / 1e6:>8.2f}"
+        )
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    print(format_table(evaluate(n=5_000, table_sizes=(100, 1024))))
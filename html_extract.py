@@ -0,0 +1,273 @@
+# Streaming and Parallel HTML Extraction
+#
+# module_12 in python_tour.py builds a whole BeautifulSoup tree with 'html.parser'
+# for one tiny document. Over hundreds of thousands of saved pages that is the
+# slowest parser and the most memory-hungry approach, because every node of every
+# page becomes a Python object even when we want only a title and a price. Here
+# the pages are parsed as a stream of events, parsing stops as soon as every
+# requested selector has been found, and files are spread over a process pool.
+#
+# Selectors are deliberately simple: "tag", ".class", "#id", "tag.class" or
+# "tag#id". The first match of each selector wins.
+
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+READ_SIZE = 64 * 1024
+
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+})
+
+# Elements whose end tag HTML lets authors leave out: a start tag from the
+# first set closes an open element of this name, unless a scope boundary from
+# the second set is open in between.
+_IMPLIED_CLOSE = {
+    "li": ({"li"}, {"ul", "ol"}),
+    "dt": ({"dt", "dd"}, {"dl"}),
+    "dd": ({"dt", "dd"}, {"dl"}),
+    "td": ({"td", "th", "tr", "tbody", "thead", "tfoot"}, {"table"}),
+    "th": ({"td", "th", "tr", "tbody", "thead", "tfoot"}, {"table"}),
+    "tr": ({"tr", "tbody", "thead", "tfoot"}, {"table"}),
+    "option": ({"option", "optgroup"}, {"select", "datalist"}),
+    "p": ({"address", "article", "aside", "blockquote", "div", "dl", "fieldset",
+           "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+           "main", "nav", "ol", "p", "pre", "section", "table", "ul"},
+          {"button", "table", "td", "th", "li", "dd", "dt", "div", "section",
+           "article", "blockquote", "form"}),
+}
+
+# 1. Selectors
+def parse_selector(selector):
+    """
+    Splits a simple selector into (tag, id, class); missing parts are None.
+    """
+    tag, ident, cls = selector, None, None
+    if "#" in tag:
+        tag, ident = tag.split("#", 1)
+    elif "." in tag:
+        tag, cls = tag.split(".", 1)
+    return (tag.lower() or None), ident, cls
+
+def selector_matches(parsed, tag, attrs):
+    want_tag, want_id, want_class = parsed
+    if want_tag is not None and want_tag != tag:
+        return False
+    if want_id is not None and attrs.get("id") != want_id:
+        return False
+    if want_class is not None and want_class not in (attrs.get("class") or "").split():
+        return False
+    return True
+
+class _Done(Exception):
+    pass
+
+# 2. Event-Based Backend (standard library)
+class _SelectorParser(HTMLParser):
+    """
+    Captures the text of the first element matching each selector and raises
+    _Done as soon as every selector has been captured.
+
+    It keeps a stack of open elements so that elements HTML closes implicitly
+    (an unclosed <li> before the next <li>, any open child at its parent's end
+    tag) finish their capture, and flushes whatever is still open at EOF.
+    """
+    def __init__(self, selectors):
+        super().__init__(convert_charrefs=True)
+        self.pending = {s: parse_selector(s) for s in selectors}
+        self.results = dict.fromkeys(selectors)
+        self.stack = []
+        # Each open capture is [selector, stack depth of its element, text parts].
+        self.captures = []
+
+    def _pop_to(self, depth):
+        del self.stack[depth:]
+        while self.captures and self.captures[-1][1] >= depth:
+            self._finish(self.captures.pop())
+
+    def handle_starttag(self, tag, attrs):
+        for name, (closers, boundary) in _IMPLIED_CLOSE.items():
+            if tag not in closers:
+                continue
+            for depth in range(len(self.stack) - 1, -1, -1):
+                if self.stack[depth] == name:
+                    self._pop_to(depth)
+                    break
+                if self.stack[depth] in boundary:
+                    break
+        attrs = dict(attrs)
+        depth = len(self.stack)
+        for selector, parsed in list(self.pending.items()):
+            if selector_matches(parsed, tag, attrs):
+                del self.pending[selector]
+                if tag in VOID_TAGS:
+                    self._finish([selector, depth, []])
+                else:
+                    self.captures.append([selector, depth, []])
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        # Closes the nearest open element of this name and anything left open
+        # inside it; a stray end tag is ignored.
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth] == tag:
+                self._pop_to(depth)
+                return
+
+    def handle_data(self, data):
+        for capture in self.captures:
+            capture[2].append(data)
+
+    def close(self):
+        super().close()
+        self._pop_to(0)
+
+    def _finish(self, capture):
+        self.results[capture[0]] = "".join(capture[2]).strip()
+        if not self.pending and not self.captures:
+            raise _Done
+
+def extract_stdlib(path, selectors):
+    parser = _SelectorParser(selectors)
+    with open(path, encoding="utf-8", errors="replace") as file:
+        try:
+            while chunk := file.read(READ_SIZE):
+                parser.feed(chunk)
+            parser.close()
+        except _Done:
+            pass
+    return parser.results
+
+# 3. Event-Based Backend (lxml, optional)
+def extract_lxml(path, selectors):
+    from lxml import etree
+
+    pending = {s: parse_selector(s) for s in selectors}
+    results = dict.fromkeys(selectors)
+    # Matches are decided on "start" events, so the outermost (first in
+    # document order) element wins, as in the other backends; the text is read
+    # once that element's "end" arrives.
+    active = {}  # element -> selectors waiting for its end
+    parser = etree.HTMLPullParser(events=("start", "end"))
+
+    def handle(events):
+        for event, element in events:
+            if not isinstance(element.tag, str):
+                continue
+            if event == "start":
+                tag = element.tag.lower()
+                for selector, parsed in list(pending.items()):
+                    if selector_matches(parsed, tag, element.attrib):
+                        active.setdefault(element, []).append(selector)
+                        del pending[selector]
+                continue
+            for selector in active.pop(element, ()):
+                results[selector] = "".join(element.itertext()).strip()
+            if not active:
+                # Nothing still needs this subtree's text; free it.
+                element.clear()
+            if not pending and not active:
+                return True
+        return False
+
+    with open(path, "rb") as file:
+        done = False
+        while not done and (chunk := file.read(READ_SIZE)):
+            parser.feed(chunk)
+            done = handle(parser.read_events())
+        if not done:
+            parser.close()
+            handle(parser.read_events())
+    return results
+
+# 4. Full-Tree Backend (the module_12 approach, kept as the baseline)
+def extract_bs4(path, selectors, features="html.parser"):
+    from bs4 import BeautifulSoup
+
+    with open(path, encoding="utf-8", errors="replace") as file:
+        soup = BeautifulSoup(file, features)
+    results = {}
+    for selector in selectors:
+        node = soup.select_one(selector)
+        results[selector] = node.get_text().strip() if node is not None else None
+    return results
+
+BACKENDS = {"stdlib": extract_stdlib, "lxml": extract_lxml, "bs4": extract_bs4}
+
+# 5. Pipeline
+def _extract_one(job):
+    backend, path, selectors = job
+    return path, BACKENDS[backend](path, selectors)
+
+def extract_many(paths, selectors, backend="stdlib", workers=None, chunksize=64):
+    """
+    Yields (path, {selector: text}) for every file, in input order, spreading
+    the files across a process pool.
+    """
+    selectors = tuple(selectors)
+    jobs = ((backend, path, selectors) for path in paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(_extract_one, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_extract_one, jobs, chunksize=chunksize)
+
+def iter_html_files(directory):
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith((".html", ".htm")):
+                yield os.path.join(root, name)
+
+# 6. Benchmark
+def benchmark(paths, selectors, backends=("stdlib", "lxml", "bs4"), workers=None):
+    """
+    Returns {backend: {"pages_per_sec", "peak_bytes"}}. Throughput is measured
+    through the process pool; peak memory is the tracemalloc peak of a
+    single-process pass over the first few pages.
+    """
+    paths = list(paths)
+    report = {}
+    for backend in backends:
+        try:
+            BACKENDS[backend](paths[0], selectors)
+        except ImportError:
+            continue
+        tracemalloc.start()
+        for path in paths[:50]:
+            BACKENDS[backend](path, selectors)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        count = sum(1 for _ in extract_many(paths, selectors, backend, workers))
+        elapsed = time.perf_counter() - start
+        report[backend] = {"pages_per_sec": count / elapsed if elapsed else float("inf"),
+                           "peak_bytes": peak}
+    return report
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filler = "<p class='filler'>lorem ipsum</p>" * 5000
+        for i in range(200):
+            with open(os.path.join(tmp, f"page_{i}.html"), "w") as file:
+                file.write(f"<html><body><h1>Welcome to Web Scraping {i}!</h1>"
+                           f"<span id='price'>{i}.99</span>{filler}</body></html>")
+
+        paths = sorted(iter_html_files(tmp))
+        print("Scraped:", next(extract_many(paths, ["h1", "#price"], workers=1)))
+        for backend, stats in benchmark(paths, ["h1", "#price"]).items():
+            print(f"{backend:>6}: {stats['pages_per_sec']:8.1f} pages/s, "
+                  f"peak {stats['peak_bytes'] / 1024:8.1f} KiB")
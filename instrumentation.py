@@ -0,0 +1,248 @@
+# Hot-Path Instrumentation
+#
+# module_3 in python_tour.py shows the decorator idea with uppercase_decorator -
+# a wrapper that runs around the real function. The same idea makes a profiler
+# you can leave in production: a wrapper that counts calls, times them into a
+# latency histogram, and optionally measures tracemalloc allocation deltas.
+#
+# There are two ways in:
+#   - @instrument on a function you own. When the registry is disabled the
+#     wrapper costs one attribute check before calling through.
+#   - registry.instrument_module(lc_patterns) to wrap an existing module's
+#     functions in place, and registry.restore() to put the originals back.
+#     Nothing is wrapped until you ask, so this path is free when off.
+#
+# Note: recursive functions (dfs, fibonacci) look themselves up through the
+# module globals, so once wrapped every recursive call is counted too.
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+import types
+
+# Latency bucket upper bounds in seconds, 1us .. 10s on a 1-2.5-5 ladder.
+DEFAULT_BUCKETS = tuple(
+    float(f"{base}e{exp}") for exp in range(-6, 1) for base in (1, 2.5, 5)
+) + (10.0,)
+
+# 1. Per-Function Metrics
+class Metric:
+    """
+    Call count, total time, latency histogram and allocation totals for one name.
+    """
+    __slots__ = ("name", "buckets", "bucket_counts", "count", "total_seconds",
+                 "max_seconds", "alloc_bytes", "errors")
+
+    def __init__(self, name, buckets):
+        self.name = name
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.alloc_bytes = 0
+        self.errors = 0
+
+    def observe(self, seconds, alloc_bytes=0, error=False):
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.alloc_bytes += alloc_bytes
+        self.errors += error
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.count if self.count else 0.0,
+            "max_seconds": self.max_seconds,
+            "alloc_bytes": self.alloc_bytes,
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.bucket_counts)),
+        }
+
+# 2. The Registry
+class Registry:
+    """
+    Holds metrics for every instrumented function and the on/off switches.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.enabled = False
+        self.trace_allocations = False
+        self._started_tracing = False  # only stop tracemalloc if we started it
+        self.metrics = {}
+        self._lock = threading.Lock()
+        self._patched = []  # (namespace, attribute, original)
+
+    def enable(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self.trace_allocations = False
+
+    def reset(self):
+        with self._lock:
+            self.metrics.clear()
+
+    def record(self, name, seconds, alloc_bytes=0, error=False):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric(name, self.buckets)
+            metric.observe(seconds, alloc_bytes, error)
+
+    # 3. Wrapping Functions
+    def wrap(self, func, name=None):
+        """
+        Returns a wrapper around func that reports to this registry while enabled.
+        """
+        name = name or f"{func.__module__}.{func.__qualname__}"
+        registry = self
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            tracing = registry.trace_allocations
+            if tracing:
+                before = tracemalloc.get_traced_memory()[0]
+            error = False
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                elapsed = perf_counter() - start
+                alloc = tracemalloc.get_traced_memory()[0] - before if tracing else 0
+                registry.record(name, elapsed, alloc, error)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def instrument(self, func=None, *, name=None):
+        """
+        Decorator form of wrap(); usable as @instrument or @instrument(name=...).
+        """
+        if func is None:
+            return functools.partial(self.instrument, name=name)
+        return self.wrap(func, name)
+
+    def instrument_module(self, module, names=None):
+        """
+        Replaces module-level functions with instrumented wrappers, in place.
+        By default every public plain function defined in the module is wrapped;
+        _private helpers are left alone.
+        Returns the list of wrapped names.
+        """
+        if names is None:
+            names = [
+                attr for attr, value in vars(module).items()
+                if isinstance(value, types.FunctionType)
+                and value.__module__ == module.__name__
+                and not attr.startswith("_")
+            ]
+        for attr in names:
+            original = getattr(module, attr)
+            setattr(module, attr, self.wrap(original, f"{module.__name__}.{attr}"))
+            self._patched.append((module, attr, original))
+        return list(names)
+
+    def restore(self):
+        """
+        Puts back every function replaced by instrument_module.
+        """
+        while self._patched:
+            module, attr, original = self._patched.pop()
+            setattr(module, attr, original)
+
+    # 4. Exporting
+    def snapshot(self):
+        with self._lock:
+            return {name: metric.as_dict() for name, metric in self.metrics.items()}
+
+    def to_json(self, **dumps_kwargs):
+        return json.dumps(self.snapshot(), **dumps_kwargs)
+
+    def to_prometheus(self, prefix="snakeden"):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {prefix}_calls_total Calls per instrumented function.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        snapshot = self.snapshot()
+        for name, data in snapshot.items():
+            lines.append(f'{prefix}_calls_total{{function="{name}"}} {data["count"]}')
+        lines += [
+            f"# HELP {prefix}_errors_total Calls that raised.",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        for name, data in snapshot.items():
+            lines.append(f'{prefix}_errors_total{{function="{name}"}} {data["errors"]}')
+        lines += [
+            # Net tracemalloc deltas go negative when a call frees memory, and
+            # Prometheus counters must never decrease, so this is a gauge.
+            f"# HELP {prefix}_alloc_bytes Net bytes allocated (tracemalloc).",
+            f"# TYPE {prefix}_alloc_bytes gauge",
+        ]
+        for name, data in snapshot.items():
+            lines.append(f'{prefix}_alloc_bytes{{function="{name}"}} {data["alloc_bytes"]}')
+        lines += [
+            f"# HELP {prefix}_latency_seconds Call latency.",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        for name, data in snapshot.items():
+            cumulative = 0
+            for bound, count in data["buckets"].items():
+                cumulative += count
+                lines.append(
+                    f'{prefix}_latency_seconds_bucket{{function="{name}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'{prefix}_latency_seconds_sum{{function="{name}"}} {data["total_seconds"]}')
+            lines.append(f'{prefix}_latency_seconds_count{{function="{name}"}} {data["count"]}')
+        return "\n".join(lines) + "\n"
+
+# A process-wide default registry, like the logging module's root logger.
+registry = Registry()
+instrument = registry.instrument
+instrument_module = registry.instrument_module
+
+if __name__ == "__main__":
+    import random
+
+    import lc_patterns
+
+    registry.instrument_module(lc_patterns, ["prefix_sum", "next_greater_element", "merge_intervals"])
+    registry.enable(trace_allocations=True)
+    for _ in range(200):
+        data = [random.randint(0, 1000) for _ in range(1000)]
+        lc_patterns.prefix_sum(data)
+        lc_patterns.next_greater_element(data)
+        lc_patterns.merge_intervals([[x, x + 5] for x in data])
+    registry.disable()
+    registry.restore()
+
+    print()
+    print(registry.to_json(indent=2)[:600], "...")
+    print(registry.to_prometheus()[:600], "...")
@@ -2,15 +2,59 @@
 
 print("## LeetCode Patterns ##\n")
 
+# Buffer-Protocol Inputs
+# The sequence patterns (1, 2, 3, 6, 9) also take array('q'), bytes, NumPy arrays
+# or anything else with the buffer protocol. They read it through a memoryview
+# instead of converting to a list first (8 bytes per element instead of ~36), and
+# patterns that build a sequence return a typed array for such inputs. Lists,
+# tuples and other non-buffer sequences go through untouched and still get lists back. Integer
+# results live in array('q'); if a value leaves the int64 range (large 'q'
+# sums, 'Q' data above 2**63) the result switches to a list, so the answer is
+# still exact. Buffers must be in native byte order.
+from array import array
+
+def _as_sequence(arr):
+    """
+    Returns a zero-copy 1-D memoryview for buffer-protocol inputs, else arr
+    itself (lists, tuples, ranges, strings, ...).
+    """
+    if isinstance(arr, (list, tuple)):
+        return arr
+    try:
+        view = memoryview(arr)
+    except TypeError:
+        return arr
+    if view.format[:1] in ("<", ">", "!", "="):
+        # memoryview only reads native formats; NumPy marks the others ('>q').
+        raise ValueError(f"buffer format {view.format!r} is not in native byte order; "
+                         "convert it first, e.g. arr.astype(arr.dtype.newbyteorder('='))")
+    return view.cast("B").cast(view.format) if view.ndim != 1 else view
+
+def _new_result(seq, length, fill):
+    """
+    A list for list inputs, else a typed array: 'd' for float data, 'q' otherwise.
+    Callers switch to a list (result.tolist()) on OverflowError.
+    """
+    if not isinstance(seq, memoryview):
+        return [fill] * length
+    typecode = "d" if seq.format.lstrip("@=<>!") in ("f", "d", "e") else "q"
+    return array(typecode, [fill]) * length
+
 # 1. Prefix Sum Pattern
 print("\n# 1. Prefix Sum Pattern")
 def prefix_sum(arr):
     """
     Computes prefix sums for an array.
     """
-    prefix_sums = [0] * (len(arr) + 1)
+    arr = _as_sequence(arr)
+    prefix_sums = _new_result(arr, len(arr) + 1, 0)
     for i in range(len(arr)):
-        prefix_sums[i + 1] = prefix_sums[i] + arr[i]
+        total = prefix_sums[i] + arr[i]
+        try:
+            prefix_sums[i + 1] = total
+        except OverflowError:
+            prefix_sums = prefix_sums.tolist()
+            prefix_sums[i + 1] = total
     return prefix_sums
 
 # 2. Two Pointers Pattern
@@ -19,6 +63,7 @@ def two_pointers(arr, target):
     """
     Finds pairs with two pointers that meet a target sum.
     """
+    arr = _as_sequence(arr)
     left, right = 0, len(arr) - 1
     while left < right:
         current_sum = arr[left] + arr[right]
@@ -36,7 +81,8 @@ def max_sum_subarray(arr, k):
     """
     Finds the maximum sum of a subarray of size k.
     """
-    max_sum, window_sum = 0, sum(arr[:k])
+    arr = _as_sequence(arr)
+    max_sum, window_sum = 0, sum(arr[:k])  # a memoryview slice is a view, not a copy
     for i in range(len(arr) - k):
         window_sum = window_sum - arr[i] + arr[i + k]
         max_sum = max(max_sum, window_sum)
@@ -76,10 +122,16 @@ def next_greater_element(nums):
     """
     Finds the next greater element for each item in the array.
     """
-    stack, result = [], [-1] * len(nums)
+    nums = _as_sequence(nums)
+    stack, result = [], _new_result(nums, len(nums), -1)
     for i, num in enumerate(nums):
         while stack and nums[stack[-1]] < num:
-            result[stack.pop()] = num
+            j = stack.pop()
+            try:
+                result[j] = num
+            except OverflowError:
+                result = result.tolist()
+                result[j] = num
         stack.append(i)
     return result
 
@@ -113,6 +165,7 @@ def search_rotated_array(nums, target):
     """
     Searches in a rotated sorted array.
     """
+    nums = _as_sequence(nums)
     left, right = 0, len(nums) - 1
     while left <= right:
         mid = (left + right) // 2
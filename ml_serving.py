@@ -0,0 +1,235 @@
+# Incremental Training and Batched Inference with scikit-learn
+#
+# module_14 in python_tour.py refits LinearRegression every time it runs and then
+# calls model.predict([[6]]) for a single row. In a scoring service both costs add
+# up: the refit happens on every restart, and every single-row predict pays the
+# full validation/dispatch overhead of scikit-learn. This module covers the three
+# fixes - out-of-core training, batched prediction, and an on-disk model cache.
+
+import hashlib
+import os
+import pickle
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+# 1. Training Data Fingerprints
+def fingerprint(chunks, extra=b""):
+    """
+    Returns a SHA-256 hex digest over a stream of (X, y) chunks. The shape and
+    dtype go into the hash too, so [[1, 2]] and [[1], [2]] do not collide.
+    """
+    digest = hashlib.sha256(extra)
+    for X, y in chunks:
+        for part in (np.ascontiguousarray(X), np.ascontiguousarray(y)):
+            digest.update(f"{part.dtype.str}{part.shape}".encode())
+            digest.update(part.tobytes())
+    return digest.hexdigest()
+
+# 2. On-Disk Model Cache
+class ModelCache:
+    """
+    Pickled models on disk, keyed by a training-data fingerprint.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Returns the cached model, or None on a miss (or an unreadable entry).
+        """
+        try:
+            with open(self._path(key), "rb") as file:
+                return pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key, model):
+        # Write to a temp file and rename, so a crash never leaves half a model behind.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def fit_or_load(make_model, X, y, cache):
+    """
+    Fits make_model() on (X, y) unless a model for the same data is cached.
+    """
+    key = fingerprint([(X, y)], extra=repr(make_model()).encode())
+    model = cache.get(key)
+    if model is None:
+        model = make_model().fit(X, y)
+        cache.put(key, model)
+    return model
+
+# 3. Out-of-Core Training
+def default_incremental_model():
+    from sklearn.linear_model import SGDRegressor
+
+    return SGDRegressor()
+
+def fit_incremental(chunk_source, make_model=default_incremental_model, epochs=1,
+                    cache=None):
+    """
+    Streams (X, y) chunks through an estimator's partial_fit.
+
+    chunk_source is a zero-argument callable returning a fresh iterator of chunks
+    (for example, a function that re-opens a file), since we may pass over the
+    data more than once. With a cache, one cheap hashing pass runs first and a
+    hit skips training entirely.
+    """
+    key = None
+    if cache is not None:
+        key = fingerprint(chunk_source(), extra=f"{make_model()!r}|{epochs}".encode())
+        model = cache.get(key)
+        if model is not None:
+            return model
+
+    model = make_model()
+    for _ in range(epochs):
+        for X, y in chunk_source():
+            model.partial_fit(X, y)
+
+    if cache is not None:
+        cache.put(key, model)
+    return model
+
+# 4. Batched Prediction
+class BatchPredictor:
+    """
+    Groups single-row predict requests from many callers into one vectorized
+    model.predict call.
+
+    A background thread drains the request queue, waiting at most max_wait
+    seconds (from the batch's first request) for it to fill to max_batch rows.
+    Callers get a Future back. If the batch predict fails, rows are retried one
+    at a time, so a single malformed row fails only its own Future.
+    """
+    _STOP = object()
+
+    def __init__(self, model, max_batch=1024, max_wait=0.002):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._requests = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, row):
+        """
+        Queues one feature row and returns a Future for its prediction.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchPredictor is closed")
+            self._requests.put((row, future))
+        return future
+
+    def predict_one(self, row, timeout=None):
+        return self.submit(row).result(timeout)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Queued after every accepted request, so all of them get answered.
+            self._requests.put(self._STOP)
+        self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            if item is self._STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._requests.get(timeout=remaining)
+                    else:
+                        item = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._predict(batch)
+            except Exception as error:
+                # Never let one batch take the worker down: every later
+                # submit would wait forever.
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            if stopping:
+                return
+
+    def _predict(self, batch):
+        # Drop requests whose caller cancelled; the rest can no longer be
+        # cancelled, so setting their results below is safe.
+        batch = [(row, future) for row, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        rows, futures = zip(*batch)
+        try:
+            predictions = self.model.predict(np.asarray(rows))
+        except Exception:
+            # Usually one bad row (wrong length, a string): find it by
+            # predicting each row alone, and fail only that caller.
+            for row, future in batch:
+                try:
+                    future.set_result(self.model.predict(np.asarray([row]))[0])
+                except Exception as error:
+                    future.set_exception(error)
+            return
+        for future, prediction in zip(futures, predictions):
+            future.set_result(prediction)
+
+if __name__ == "__main__":
+    from sklearn.linear_model import LinearRegression
+
+    # The module_14 data, this time fitted once and cached.
+    X = np.array([[1], [2], [3], [4], [5]])
+    y = np.array([2, 4, 6, 8, 10])
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ModelCache(tmp)
+        model = fit_or_load(LinearRegression, X, y, cache)
+        print("Cached on second call:", fit_or_load(LinearRegression, X, y, cache) is not None)
+
+        with BatchPredictor(model) as predictor:
+            futures = [predictor.submit([x]) for x in range(6, 11)]
+            print("Batched predictions:", [round(float(f.result()), 3) for f in futures])
+
+        def chunks():
+            for seed in range(10):
+                chunk_rng = np.random.default_rng(seed)
+                X_chunk = chunk_rng.uniform(0, 10, size=(1000, 1))
+                yield X_chunk, 2 * X_chunk.ravel() + chunk_rng.normal(0, 0.1, 1000)
+        streamed = fit_incremental(chunks, epochs=3, cache=cache)
+        print("Streamed coef:", streamed.coef_)
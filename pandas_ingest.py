@@ -0,0 +1,210 @@
+# Chunked Data Ingestion with Pandas
+#
+# module_10 in python_tour.py builds a DataFrame in one go and calls .mean() on it.
+# That is fine for four rows, but on a multi-GB CSV export it holds every row (and
+# every boxed string) in memory at once. This module streams the file in chunks,
+# shrinks each chunk's dtypes, and folds the chunks into running aggregates, so
+# peak memory is bounded by the chunk size rather than the file size.
+
+import os
+
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# 1. Reading in Chunks
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE, columns=None, **read_kwargs):
+    """
+    Yields DataFrame chunks from a CSV or Parquet file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize, usecols=columns, **read_kwargs)
+        with reader:
+            yield from reader
+
+# 2. Dtype Downcasting
+def downcast(df, category_ratio=0.5):
+    """
+    Shrinks a DataFrame's dtypes in place: int64 -> int32 and float64 ->
+    float32 where every value survives the narrower type exactly, and
+    low-cardinality object columns -> category. Returns the DataFrame.
+    """
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series.dtype) and series.dtype.itemsize > 4:
+            if series.empty or (series.min() >= -2**31 and series.max() < 2**31):
+                df[column] = series.astype("int32")
+        elif pd.api.types.is_float_dtype(series.dtype) and series.dtype.itemsize > 4:
+            # float32 keeps ~7 significant digits: 12345678.91 would come back
+            # as 12345679.0. Only narrow when the round trip is exact.
+            narrow = series.astype("float32")
+            if narrow.astype(series.dtype).equals(series):
+                df[column] = narrow
+        elif series.dtype == object and len(series):
+            if series.nunique(dropna=False) / len(series) <= category_ratio:
+                df[column] = series.astype("category")
+    return df
+
+# 3. Incremental Aggregates
+class RunningStats:
+    """
+    Accumulates count, mean, M2 (sum of squared deviations from the mean), min
+    and max per numeric column across chunks, so mean and std can be derived
+    without keeping the rows. Chunks are merged with Chan et al.'s parallel
+    update; a running sum of squares would cancel catastrophically on columns
+    of large values such as epoch timestamps.
+    """
+    def __init__(self):
+        self.count = None
+        self.mean = None
+        self.m2 = None
+        self.minimum = None
+        self.maximum = None
+
+    def update(self, df):
+        numeric = df.select_dtypes("number").astype("float64")
+        count = numeric.count()
+        mean = numeric.mean()
+        m2 = ((numeric - mean) ** 2).sum()
+        minimum, maximum = numeric.min(), numeric.max()
+        if self.count is None:
+            self.count, self.mean, self.m2 = count, mean, m2
+            self.minimum, self.maximum = minimum, maximum
+            return
+        columns = self.count.index.union(count.index)
+        count_a = self.count.reindex(columns, fill_value=0)
+        count_b = count.reindex(columns, fill_value=0)
+        mean_a = self.mean.reindex(columns).fillna(0.0)
+        mean_b = mean.reindex(columns).fillna(0.0)
+        total = count_a + count_b
+        share_b = (count_b / total).where(total > 0, 0.0)
+        delta = mean_b - mean_a
+        self.count = total
+        self.mean = mean_a + delta * share_b
+        self.m2 = (self.m2.reindex(columns).fillna(0.0) + m2.reindex(columns).fillna(0.0)
+                   + delta * delta * count_a * share_b)
+        self.minimum = pd.concat([self.minimum, minimum], axis=1).min(axis=1)
+        self.maximum = pd.concat([self.maximum, maximum], axis=1).max(axis=1)
+
+    def result(self):
+        """
+        Returns a DataFrame of count, mean, std, min and max per column.
+        """
+        if self.count is None:
+            return pd.DataFrame(columns=["count", "mean", "std", "min", "max"])
+        mean = self.mean.where(self.count > 0)
+        # Sample variance (matches DataFrame.std's ddof=1).
+        variance = self.m2 / (self.count - 1)
+        return pd.DataFrame({
+            "count": self.count,
+            "mean": mean,
+            "std": variance.where(self.count > 1) ** 0.5,
+            "min": self.minimum,
+            "max": self.maximum,
+        })
+
+class RunningGroupBy:
+    """
+    Accumulates per-group count, sum, min and max of the value columns across
+    chunks. Only the group table is kept in memory, never the rows.
+    """
+    def __init__(self, by, values=None):
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.values = values
+        self.partials = None
+
+    def update(self, df):
+        values = self.values or [
+            c for c in df.select_dtypes("number").columns if c not in self.by
+        ]
+        grouped = df.groupby(self.by, observed=True)[values]
+        chunk = pd.concat(
+            {"count": grouped.count(), "sum": grouped.sum(),
+             "min": grouped.min(), "max": grouped.max()},
+            axis=1,
+        )
+        if self.partials is None:
+            self.partials = chunk
+            return
+        combined = pd.concat([self.partials, chunk])
+        level = list(range(len(self.by)))
+        self.partials = pd.concat(
+            {"count": combined["count"].groupby(level=level).sum(),
+             "sum": combined["sum"].groupby(level=level).sum(),
+             "min": combined["min"].groupby(level=level).min(),
+             "max": combined["max"].groupby(level=level).max()},
+            axis=1,
+        )
+
+    def result(self):
+        """
+        Returns the per-group table with a derived mean for every value column.
+        """
+        if self.partials is None:
+            return pd.DataFrame()
+        mean = self.partials["sum"] / self.partials["count"]
+        mean.columns = pd.MultiIndex.from_product([["mean"], mean.columns])
+        return pd.concat([self.partials, mean], axis=1)
+
+# 4. Putting it Together
+def aggregate_file(path, group_by=None, values=None, chunksize=DEFAULT_CHUNKSIZE,
+                   columns=None, **read_kwargs):
+    """
+    Streams a file once and returns (summary, grouped, peak_chunk_bytes).
+    grouped is None when no group_by column is given. peak_chunk_bytes is the
+    largest chunk as read, before downcasting - the size actually held at peak.
+    """
+    stats = RunningStats()
+    groups = RunningGroupBy(group_by, values) if group_by else None
+    peak_chunk_bytes = 0
+    for chunk in read_chunks(path, chunksize, columns, **read_kwargs):
+        peak_chunk_bytes = max(peak_chunk_bytes, int(chunk.memory_usage(deep=True).sum()))
+        # Lossless, so the aggregates below see exactly the values in the file.
+        chunk = downcast(chunk)
+        stats.update(chunk)
+        if groups is not None:
+            groups.update(chunk)
+    return stats.result(), groups.result() if groups else None, peak_chunk_bytes
+
+def memory_report(path, chunksize=DEFAULT_CHUNKSIZE, **read_kwargs):
+    """
+    Compares the memory of a naive full read against the chunked, downcast path.
+    Note the naive side really does load the whole file - only run it on a file
+    that fits, or on a representative sample.
+    """
+    naive = pd.read_csv(path, **read_kwargs)
+    naive_bytes = int(naive.memory_usage(deep=True).sum())
+    downcast_bytes = int(downcast(naive).memory_usage(deep=True).sum())
+    del naive
+    _, _, chunk_bytes = aggregate_file(path, chunksize=chunksize, **read_kwargs)
+    return {
+        "naive_bytes": naive_bytes,
+        "downcast_bytes": downcast_bytes,
+        "peak_chunk_bytes": chunk_bytes,
+        "saved_bytes": naive_bytes - chunk_bytes,
+        "saved_ratio": 1 - chunk_bytes / naive_bytes if naive_bytes else 0.0,
+    }
+
+if __name__ == "__main__":
+    import tempfile
+
+    # The module_10 data, written out and read back through the chunked path.
+    data = {'Name': ['Alice', 'Bob', 'Charlie', 'David'] * 25_000,
+            'Team': ['red', 'blue', 'red', 'blue'] * 25_000,
+            'Age': [24, 27, 22, 32] * 25_000,
+            'Salary': [50000, 60000, 45000, 70000] * 25_000}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "people.csv")
+        pd.DataFrame(data).to_csv(path, index=False)
+
+        summary, grouped, _ = aggregate_file(path, group_by="Team", chunksize=10_000)
+        print("Summary:\n", summary)
+        print("By team:\n", grouped)
+        print("Memory:", memory_report(path, chunksize=10_000))
@@ -0,0 +1,234 @@
+# Bulk Runner for lc_patterns
+#
+# Runs one named lc_patterns function over every record of a large input file,
+# as a batch job:
+#
+#   python -m pattern_runner prefix_sum data.jsonl -o sums.jsonl
+#   python -m pattern_runner max_sum_subarray rows.csv --arg k=3 --workers 4
+#   python -m pattern_runner next_greater_element ticks.bin --dtype d --record-size 4096
+#
+# Inputs are read as a stream through large buffered reads, never whole:
+#
+#   - JSON Lines: a JSON array is the pattern's first argument; a JSON object
+#     supplies keyword arguments by name.
+#   - CSV: each row is one array of numbers.
+#   - Raw binary: a packed array (--dtype, an array typecode) cut into records
+#     of --record-size items. These reach the patterns as typed arrays, which
+#     take the buffer-protocol path in lc_patterns.
+#
+# Records are grouped into batches; with --workers, batches run in a process
+# pool with a bounded number in flight, so memory stays flat however big the
+# input is. Results are written in input order, one JSON line per record, as
+# each batch finishes. A summary with records/sec and peak memory goes to
+# stderr so it never mixes with results on stdout.
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import resource
+except ImportError:  # Windows: no peak-RSS figure
+    resource = None
+
+READ_SIZE = 1 << 20
+# .json is left out on purpose: a plain JSON file is one document, not one per line.
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv",
+           ".bin": "bin", ".dat": "bin", ".raw": "bin"}
+
+def load_patterns():
+    """
+    {name: function} for every public function in lc_patterns. The module
+    prints section headings on import; they are swallowed here.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        import lc_patterns
+    return {name: obj for name, obj in vars(lc_patterns).items()
+            if callable(obj) and not name.startswith("_")
+            and getattr(obj, "__module__", None) == "lc_patterns"}
+
+# 1. Streaming Readers
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+def read_jsonl(path):
+    with _open_text(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+def read_csv(path):
+    with _open_text(path) as file:
+        for row in csv.reader(file):
+            if row:
+                yield [_number(cell) for cell in row]
+
+def read_binary(path, typecode="q", record_size=1024):
+    """
+    Fixed-size records from a packed array file; the last may be shorter.
+    """
+    itemsize = array(typecode).itemsize
+    block = max(1, READ_SIZE // (itemsize * record_size)) * itemsize * record_size
+    with open(path, "rb", buffering=0) as file:
+        while chunk := file.read(block):
+            if len(chunk) % itemsize:
+                raise ValueError(f"{path}: size is not a multiple of {itemsize} bytes")
+            values = array(typecode, chunk)
+            for start in range(0, len(values), record_size):
+                yield values[start:start + record_size]
+
+def _open_text(path):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, encoding="utf-8", newline="", buffering=READ_SIZE)
+
+def open_records(path, fmt=None, typecode="q", record_size=1024):
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt == "jsonl":
+        return read_jsonl(path)
+    if fmt == "csv":
+        return read_csv(path)
+    if fmt == "bin":
+        return read_binary(path, typecode, record_size)
+    raise ValueError(f"cannot tell the format of {path!r}; pass --format")
+
+# 2. Running Batches
+_patterns = None
+
+def _to_json(value):
+    if isinstance(value, (array, memoryview, tuple, set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def run_batch(name, records, kwargs):
+    """
+    Applies the named pattern to each record; returns one JSON line per record.
+    Errors are reported per record rather than failing the whole job.
+    """
+    global _patterns
+    if _patterns is None:
+        _patterns = load_patterns()
+    func = _patterns[name]
+    lines = []
+    for record in records:
+        try:
+            if isinstance(record, dict):
+                result = func(**{**kwargs, **record})
+            else:
+                result = func(record, **kwargs)
+            lines.append(json.dumps({"result": result}, default=_to_json))
+        except Exception as exc:
+            lines.append(json.dumps({"error": f"{type(exc).__name__}: {exc}"}))
+    return "\n".join(lines) + "\n"
+
+def _batches(records, batch_size):
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        yield batch
+
+def run(name, records, out, kwargs=None, batch_size=1000, workers=0):
+    """
+    Streams records through the pattern and writes results to out as they
+    complete, in input order. Returns the number of records processed.
+    """
+    kwargs = kwargs or {}
+    count = 0
+    if workers <= 0:
+        for batch in _batches(records, batch_size):
+            out.write(run_batch(name, batch, kwargs))
+            count += len(batch)
+        return count
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in _batches(records, batch_size):
+            if len(pending) >= 2 * workers:
+                out.write(pending.popleft().result())
+            pending.append(pool.submit(run_batch, name, batch, kwargs))
+            count += len(batch)
+        while pending:
+            out.write(pending.popleft().result())
+    return count
+
+# 3. Reporting
+def peak_memory():
+    """
+    Peak resident memory in bytes of this process plus its largest finished worker,
+    or None where the platform does not report it.
+    """
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return (own + children) * scale
+
+def _parse_arg(text):
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected name=value, got {text!r}")
+    try:
+        return name, json.loads(value)
+    except json.JSONDecodeError:
+        return name, value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pattern_runner",
+                                     description="Run an lc_patterns function over every record of a file.")
+    parser.add_argument("pattern", nargs="?", help="function name in lc_patterns")
+    parser.add_argument("input", nargs="?", help="input file, or - for stdin (JSONL/CSV)")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file (default stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv", "bin"], help="input format (default from extension)")
+    parser.add_argument("--dtype", default="q", help="array typecode of binary input (default q)")
+    parser.add_argument("--record-size", type=int, default=1024, help="items per binary record")
+    parser.add_argument("--arg", action="append", type=_parse_arg, default=[],
+                        help="extra keyword argument, name=value (value parsed as JSON)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = run inline)")
+    parser.add_argument("--list", action="store_true", help="list available patterns and exit")
+    args = parser.parse_args(argv)
+
+    patterns = load_patterns()
+    if args.list:
+        print("\n".join(sorted(patterns)))
+        return 0
+    if not args.pattern or not args.input:
+        parser.error("pattern and input are required")
+    if args.pattern not in patterns:
+        parser.error(f"unknown pattern {args.pattern!r}; see --list")
+
+    if args.input == "-" and args.format in (None, "bin"):
+        parser.error("reading stdin needs --format jsonl or --format csv")
+    try:
+        records = open_records(args.input, args.format, args.dtype, args.record_size)
+    except ValueError as error:
+        parser.error(str(error))
+    start = time.perf_counter()
+    with (contextlib.nullcontext(sys.stdout) if args.output == "-"
+          else open(args.output, "w", encoding="utf-8", buffering=READ_SIZE)) as out:
+        count = run(args.pattern, records, out, dict(args.arg), args.batch_size, args.workers)
+    elapsed = time.perf_counter() - start
+
+    peak = peak_memory()
+    rate = count / elapsed if elapsed else float("inf")
+    memory = f"{peak / 2**20:.1f} MiB" if peak is not None else "n/a"
+    print(f"{count} records in {elapsed:.2f}s ({rate:,.0f} records/s), peak memory {memory}",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+# Bloom and Cuckoo Filters
+#
+# Hash.md builds MyHashTable, which stores every key so it can answer "is this
+# key here?" exactly. When all we need is a cheap "definitely not here" before a
+# slow disk or database lookup, a probabilistic filter answers the same question
+# in a handful of bits per key. It never gives a false negative, and it gives
+# false positives at a rate we choose up front.
+#
+#   - BloomFilter: a bit array plus k hash positions per key. Sized from the
+#     expected key count and a target false-positive rate. No deletion.
+#   - CuckooFilter: small fingerprints in 4-slot buckets, each key having two
+#     candidate buckets. Supports deletion at similar space.
+#
+# Both hash keys with blake2b rather than Python's hash(), which is salted per
+# process (see "Python's Hash Function" in Hash.md). A filter serialized in one
+# process must give the same answers when it is loaded in another.
+
+import hashlib
+import math
+import random
+import struct
+from array import array
+
+# 1. Hashing Keys
+def key_bytes(key):
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return bytes(key)
+    if isinstance(key, str):
+        return key.encode("utf-8")
+    if isinstance(key, int):
+        return key.to_bytes((key.bit_length() + 8) // 8 or 1, "little", signed=True)
+    return repr(key).encode("utf-8")
+
+def hash_pair(key):
+    """
+    Two independent 64-bit hashes of a key, from a single 128-bit digest.
+    """
+    digest = hashlib.blake2b(key_bytes(key), digest_size=16).digest()
+    return struct.unpack("<QQ", digest)
+
+# 2. Bloom Filter
+class BloomFilter:
+    """
+    A bit-array Bloom filter using double hashing: position i of a key is
+    (h1 + i * h2) mod m, so one digest yields all k positions.
+    """
+    _HEADER = struct.Struct("<4sQQQ")  # magic, m bits, k hashes, items added
+    _MAGIC = b"BLM1"
+
+    def __init__(self, capacity=1000, error_rate=0.01, num_bits=None, num_hashes=None):
+        if num_bits is None:
+            if capacity <= 0 or not 0 < error_rate < 1:
+                raise ValueError("capacity must be positive and 0 < error_rate < 1")
+            num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        h1, h2 = hash_pair(key)
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, key):
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        for pos in self._positions(key):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def false_positive_rate(self):
+        """
+        Expected false-positive rate at the current fill.
+        """
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def nbytes(self):
+        return len(self.bits)
+
+    def union(self, other):
+        """
+        Returns a filter containing the keys of both. The two must share size
+        and hash count (for example, both built with the same parameters).
+        """
+        if (self.num_bits, self.num_hashes) != (other.num_bits, other.num_hashes):
+            raise ValueError("can only union Bloom filters with identical parameters")
+        merged = BloomFilter(num_bits=self.num_bits, num_hashes=self.num_hashes)
+        merged.bits = bytearray(a | b for a, b in zip(self.bits, other.bits))
+        # An upper bound: keys present in both were counted twice.
+        merged.count = self.count + other.count
+        return merged
+
+    __or__ = union
+
+    def to_bytes(self):
+        return self._HEADER.pack(self._MAGIC, self.num_bits, self.num_hashes, self.count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, num_bits, num_hashes, count = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("not a serialized BloomFilter")
+        bloom = cls(num_bits=num_bits, num_hashes=num_hashes)
+        bloom.bits = bytearray(data[cls._HEADER.size:])
+        bloom.count = count
+        return bloom
+
+# 3. Cuckoo Filter
+class CuckooFilter:
+    """
+    A cuckoo filter with 4-slot buckets and 16-bit fingerprints (~0.01% false
+    positives at 95% load). A key lives in bucket i1 or i2 = i1 ^ H(fingerprint),
+    so either bucket can be found from the other plus the fingerprint alone -
+    which is what makes deletion and relocation possible without the key.
+
+    When a run of evictions ends with a fingerprint that has nowhere to go, it
+    is parked in a one-entry victim stash rather than dropped, so no stored
+    key ever reads as absent. Once the stash is in use the filter is full:
+    further adds raise OverflowError without changing anything.
+    """
+    BUCKET_SIZE = 4
+    MAX_KICKS = 500
+    # magic, number of buckets, items stored, victim fingerprint (0 = none), victim bucket
+    _HEADER = struct.Struct("<4sQQHQ")
+    _MAGIC = b"CKO2"
+
+    def __init__(self, capacity=1000):
+        # Power-of-two bucket count so the XOR trick stays inside the table.
+        buckets = max(1, math.ceil(capacity / (self.BUCKET_SIZE * 0.95)))
+        self.num_buckets = 1 << (buckets - 1).bit_length()
+        self.slots = array("H", bytes(2 * self.num_buckets * self.BUCKET_SIZE))
+        self.count = 0
+        self.victim = None  # (fingerprint, bucket) that found no free slot
+
+    def _fingerprint_and_index(self, key):
+        h1, h2 = hash_pair(key)
+        fingerprint = (h2 & 0xFFFF) or 1  # 0 marks an empty slot
+        return fingerprint, h1 & (self.num_buckets - 1)
+
+    def _alt_index(self, index, fingerprint):
+        # Multiplicative hash of the fingerprint (constant from MurmurHash2).
+        return (index ^ (fingerprint * 0x5BD1E995)) & (self.num_buckets - 1)
+
+    def _bucket_range(self, index):
+        start = index * self.BUCKET_SIZE
+        return range(start, start + self.BUCKET_SIZE)
+
+    def _insert_into(self, index, fingerprint):
+        slots = self.slots
+        for slot in self._bucket_range(index):
+            if slots[slot] == 0:
+                slots[slot] = fingerprint
+                return True
+        return False
+
+    def _insert_fingerprint(self, fingerprint, index):
+        if self.victim is not None:
+            raise OverflowError("cuckoo filter is full")
+        alt = self._alt_index(index, fingerprint)
+        if self._insert_into(index, fingerprint) or self._insert_into(alt, fingerprint):
+            self.count += 1
+            return True
+        # Both full: evict a random resident and move it to its other bucket.
+        index = random.choice((index, alt))
+        for _ in range(self.MAX_KICKS):
+            slot = random.choice(self._bucket_range(index))
+            fingerprint, self.slots[slot] = self.slots[slot], fingerprint
+            index = self._alt_index(index, fingerprint)
+            if self._insert_into(index, fingerprint):
+                self.count += 1
+                return True
+        # The last evicted fingerprint is homeless: stash it so its key still
+        # reads as present. The next add will be refused.
+        self.victim = (fingerprint, index)
+        self.count += 1
+        return True
+
+    def add(self, key):
+        fingerprint, index = self._fingerprint_and_index(key)
+        return self._insert_fingerprint(fingerprint, index)
+
+    def __contains__(self, key):
+        fingerprint, index = self._fingerprint_and_index(key)
+        slots = self.slots
+        buckets = (index, self._alt_index(index, fingerprint))
+        for bucket in buckets:
+            for slot in self._bucket_range(bucket):
+                if slots[slot] == fingerprint:
+                    return True
+        return self.victim is not None and self.victim[0] == fingerprint and self.victim[1] in buckets
+
+    def remove(self, key):
+        """
+        Deletes one copy of key. Only delete keys that were added - removing a
+        key that was never added can delete another key's matching fingerprint.
+        """
+        fingerprint, index = self._fingerprint_and_index(key)
+        slots = self.slots
+        buckets = (index, self._alt_index(index, fingerprint))
+        if self.victim is not None and self.victim[0] == fingerprint and self.victim[1] in buckets:
+            self.victim = None
+            self.count -= 1
+            return
+        for bucket in buckets:
+            for slot in self._bucket_range(bucket):
+                if slots[slot] == fingerprint:
+                    slots[slot] = 0
+                    self.count -= 1
+                    self._rehome_victim()
+                    return
+        raise KeyError(f'Key {key} not found')
+
+    def _rehome_victim(self):
+        # A slot just opened up; give the stashed fingerprint another try.
+        if self.victim is not None:
+            fingerprint, index = self.victim
+            self.victim = None
+            self.count -= 1
+            self._insert_fingerprint(fingerprint, index)
+
+    def __len__(self):
+        return self.count
+
+    def load_factor(self):
+        return self.count / len(self.slots)
+
+    def nbytes(self):
+        return len(self.slots) * self.slots.itemsize
+
+    def union(self, other):
+        """
+        Returns a filter holding the fingerprints of both. Both must have the
+        same number of buckets; raises OverflowError if the result is too full
+        (neither input is changed).
+        """
+        if self.num_buckets != other.num_buckets:
+            raise ValueError("can only union cuckoo filters with the same bucket count")
+        merged = CuckooFilter.from_bytes(self.to_bytes())
+        for slot, fingerprint in enumerate(other.slots):
+            if fingerprint:
+                merged._insert_fingerprint(fingerprint, slot // self.BUCKET_SIZE)
+        if other.victim is not None:
+            merged._insert_fingerprint(*other.victim)
+        return merged
+
+    __or__ = union
+
+    def to_bytes(self):
+        victim_fingerprint, victim_index = self.victim or (0, 0)
+        header = self._HEADER.pack(self._MAGIC, self.num_buckets, self.count,
+                                   victim_fingerprint, victim_index)
+        return header + self.slots.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, num_buckets, count, victim_fingerprint, victim_index = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("not a serialized CuckooFilter")
+        cuckoo = cls.__new__(cls)
+        cuckoo.num_buckets = num_buckets
+        cuckoo.slots = array("H")
+        cuckoo.slots.frombytes(data[cls._HEADER.size:])
+        cuckoo.count = count
+        cuckoo.victim = (victim_fingerprint, victim_index) if victim_fingerprint else None
+        return cuckoo
+
+# 4. Benchmarks
+def benchmark(make_filter, n=100_000, lookups=100_000):
+    """
+    Fills a filter with n keys and reports bits per key, measured false-positive
+    rate, and lookups per second (half hits, half misses).
+    """
+    import time
+
+    filt = make_filter(n)
+    for i in range(n):
+        filt.add(f"key-{i}")
+    probes = [f"key-{i}" for i in range(lookups // 2)] + [f"miss-{i}" for i in range(lookups // 2)]
+
+    start = time.perf_counter()
+    hits = sum(1 for probe in probes if probe in filt)
+    elapsed = time.perf_counter() - start
+
+    false_positives = hits - lookups // 2
+    return {
+        "bits_per_key": filt.nbytes() * 8 / n,
+        "false_positive_rate": false_positives / (lookups // 2),
+        "lookups_per_sec": lookups / elapsed,
+    }
+
+if __name__ == "__main__":
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for word in ("apple", "banana", "orange"):
+        bloom.add(word)
+    print("banana in bloom:", "banana" in bloom, "| kiwi in bloom:", "kiwi" in bloom)
+    print("Round trip:", "apple" in BloomFilter.from_bytes(bloom.to_bytes()))
+
+    cuckoo = CuckooFilter(capacity=1000)
+    cuckoo.add("apple")
+    cuckoo.remove("apple")
+    print("apple after remove:", "apple" in cuckoo)
+
+    print("Bloom: ", benchmark(lambda n: BloomFilter(n, 0.01)))
+    print("Cuckoo:", benchmark(CuckooFilter))
@@ -0,0 +1,301 @@
+# Fenwick and Segment Trees
+#
+# lc_patterns.prefix_sum builds a static array: change one element and all n
+# prefix sums after it are stale, so the only fix is an O(n) rebuild. These
+# trees keep prefix/range answers live under updates, both in O(log n):
+#
+#   - FenwickTree (binary indexed tree): point add, prefix and range sums.
+#     RangeFenwickTree pairs two of them for range add + range sum.
+#   - SegmentTree: lazy propagation, so "add v to every element in [l, r)"
+#     is O(log n) too, with range sum, min and max queries.
+#
+# All ranges are half-open [l, r) and 0-indexed, like Python slices. Storage is
+# typed arrays: typecode "q" (64-bit ints, the default) or "d" (floats).
+# Construction from existing data is O(n), not n separate O(log n) inserts.
+
+from array import array
+
+# 1. Fenwick Tree
+class FenwickTree:
+    """
+    tree[i] (1-indexed) holds the sum of the (i & -i) elements ending at i.
+    """
+    def __init__(self, values=(), size=None, typecode="q"):
+        values = array(typecode, values)
+        n = len(values) if size is None else size
+        self.n = n
+        self.typecode = typecode
+        self.tree = array(typecode, bytes(array(typecode).itemsize * (n + 1)))
+        tree = self.tree
+        tree[1:len(values) + 1] = values
+        # O(n) build: push each node's total into its parent once.
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+
+    def __len__(self):
+        return self.n
+
+    def add(self, index, delta):
+        """
+        values[index] += delta.
+        """
+        tree, n = self.tree, self.n
+        i = index + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, stop):
+        """
+        Sum of values[:stop].
+        """
+        tree, total = self.tree, 0
+        i = stop
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, start, stop):
+        return self.prefix_sum(stop) - self.prefix_sum(start)
+
+    def __getitem__(self, index):
+        return self.range_sum(index, index + 1)
+
+    def __setitem__(self, index, value):
+        self.add(index, value - self[index])
+
+    def add_many(self, updates):
+        """
+        Applies (index, delta) pairs in order.
+        """
+        for index, delta in updates:
+            self.add(index, delta)
+
+    def range_sum_many(self, ranges):
+        return [self.prefix_sum(stop) - self.prefix_sum(start) for start, stop in ranges]
+
+    def search(self, target):
+        """
+        Smallest stop with prefix_sum(stop) >= target, for non-negative values
+        (for example, sampling by cumulative weight). Returns n + 1 if none.
+        """
+        if target <= 0:
+            return 0  # the empty prefix already reaches it
+        tree, n = self.tree, self.n
+        pos, remaining = 0, target
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] < remaining:
+                pos = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return pos + 1
+
+class RangeFenwickTree:
+    """
+    Range add and range sum with two Fenwick trees. With B1 and B2 maintained
+    as below, prefix_sum(i) = B1.prefix(i) * i - B2.prefix(i).
+    """
+    def __init__(self, values=(), size=None, typecode="q"):
+        values = array(typecode, values)
+        n = len(values) if size is None else size
+        self.n = n
+        # Start from a difference array: a range add at one point per value.
+        diffs = array(typecode, bytes(array(typecode).itemsize * n))
+        weighted = array(typecode, bytes(array(typecode).itemsize * n))
+        previous = 0
+        for i, value in enumerate(values):
+            diffs[i] = value - previous
+            weighted[i] = (value - previous) * i
+            previous = value
+        self._b1 = FenwickTree(diffs, typecode=typecode)
+        self._b2 = FenwickTree(weighted, typecode=typecode)
+
+    def __len__(self):
+        return self.n
+
+    def range_add(self, start, stop, delta):
+        """
+        values[start:stop] += delta.
+        """
+        self._b1.add(start, delta)
+        self._b2.add(start, delta * start)
+        if stop < self.n:
+            self._b1.add(stop, -delta)
+            self._b2.add(stop, -delta * stop)
+
+    def add(self, index, delta):
+        self.range_add(index, index + 1, delta)
+
+    def prefix_sum(self, stop):
+        return self._b1.prefix_sum(stop) * stop - self._b2.prefix_sum(stop)
+
+    def range_sum(self, start, stop):
+        return self.prefix_sum(stop) - self.prefix_sum(start)
+
+    def __getitem__(self, index):
+        return self._b1.prefix_sum(index + 1)
+
+# 2. Lazy Segment Tree
+class SegmentTree:
+    """
+    Iterative lazy segment tree over a power-of-two leaf count. Every node keeps
+    the sum, min and max of its range plus a pending add for its children, so
+    one tree answers all three queries.
+    """
+    def __init__(self, values=(), size=None, typecode="q"):
+        values = array(typecode, values)
+        n = len(values) if size is None else size
+        self.n = n
+        self.typecode = typecode
+        log = max(1, (n - 1).bit_length())
+        self.log = log
+        self.size = size_ = 1 << log
+        if typecode == "d":
+            top, bottom = float("inf"), float("-inf")
+        else:
+            top, bottom = 2 ** 62, -2 ** 62
+        self._top, self._bottom = top, bottom
+        zeros = bytes(array(typecode).itemsize * 2 * size_)
+        self.sum = array(typecode, zeros)
+        self.min = array(typecode, [top]) * (2 * size_)
+        self.max = array(typecode, [bottom]) * (2 * size_)
+        self.lazy = array(typecode, zeros[:len(zeros) // 2])
+        # Real (non-padding) leaves under each node; padded nodes ignore adds.
+        self.count = array("q", bytes(8 * 2 * size_))
+        for i in range(n):
+            leaf = size_ + i
+            value = values[i] if i < len(values) else 0
+            self.sum[leaf] = self.min[leaf] = self.max[leaf] = value
+            self.count[leaf] = 1
+        for k in range(size_ - 1, 0, -1):
+            self.count[k] = self.count[2 * k] + self.count[2 * k + 1]
+            self._pull(k)
+
+    def __len__(self):
+        return self.n
+
+    def _pull(self, k):
+        left, right = 2 * k, 2 * k + 1
+        self.sum[k] = self.sum[left] + self.sum[right]
+        self.min[k] = min(self.min[left], self.min[right])
+        self.max[k] = max(self.max[left], self.max[right])
+
+    def _apply(self, k, delta):
+        count = self.count[k]
+        if not count:
+            return
+        self.sum[k] += delta * count
+        self.min[k] += delta
+        self.max[k] += delta
+        if k < self.size:
+            self.lazy[k] += delta
+
+    def _push(self, k):
+        delta = self.lazy[k]
+        if delta:
+            self._apply(2 * k, delta)
+            self._apply(2 * k + 1, delta)
+            self.lazy[k] = 0
+
+    def _push_bounds(self, l, r):
+        for i in range(self.log, 0, -1):
+            if ((l >> i) << i) != l:
+                self._push(l >> i)
+            if ((r >> i) << i) != r:
+                self._push((r - 1) >> i)
+
+    def range_add(self, start, stop, delta):
+        """
+        values[start:stop] += delta.
+        """
+        if start >= stop:
+            return
+        l, r = start + self.size, stop + self.size
+        self._push_bounds(l, r)
+        l2, r2 = l, r
+        while l2 < r2:
+            if l2 & 1:
+                self._apply(l2, delta)
+                l2 += 1
+            if r2 & 1:
+                r2 -= 1
+                self._apply(r2, delta)
+            l2 >>= 1
+            r2 >>= 1
+        for i in range(1, self.log + 1):
+            if ((l >> i) << i) != l:
+                self._pull(l >> i)
+            if ((r >> i) << i) != r:
+                self._pull((r - 1) >> i)
+
+    def add(self, index, delta):
+        self.range_add(index, index + 1, delta)
+
+    def __setitem__(self, index, value):
+        k = index + self.size
+        for i in range(self.log, 0, -1):
+            self._push(k >> i)
+        self.sum[k] = self.min[k] = self.max[k] = value
+        for i in range(1, self.log + 1):
+            self._pull(k >> i)
+
+    def query(self, start, stop):
+        """
+        (sum, min, max) of values[start:stop].
+        """
+        if start >= stop:
+            return 0, self._top, self._bottom
+        l, r = start + self.size, stop + self.size
+        self._push_bounds(l, r)
+        total, low, high = 0, self._top, self._bottom
+        while l < r:
+            if l & 1:
+                total += self.sum[l]
+                low = min(low, self.min[l])
+                high = max(high, self.max[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                total += self.sum[r]
+                low = min(low, self.min[r])
+                high = max(high, self.max[r])
+            l >>= 1
+            r >>= 1
+        return total, low, high
+
+    def range_sum(self, start, stop):
+        return self.query(start, stop)[0]
+
+    def range_min(self, start, stop):
+        return self.query(start, stop)[1]
+
+    def range_max(self, start, stop):
+        return self.query(start, stop)[2]
+
+    def __getitem__(self, index):
+        return self.query(index, index + 1)[0]
+
+    def range_add_many(self, updates):
+        """
+        Applies (start, stop, delta) triples in order.
+        """
+        for start, stop, delta in updates:
+            self.range_add(start, stop, delta)
+
+    def query_many(self, ranges):
+        return [self.query(start, stop) for start, stop in ranges]
+
+if __name__ == "__main__":
+    counters = [5, 3, 8, 6, 1, 9]
+    fenwick = FenwickTree(counters)
+    fenwick.add(2, 10)  # counters[2] += 10, no rebuild
+    print("Sum of counters[1:4]:", fenwick.range_sum(1, 4))
+
+    segments = SegmentTree(counters)
+    segments.range_add(0, 3, -2)
+    print("After adding -2 to [0, 3): (sum, min, max) =", segments.query(0, 6))
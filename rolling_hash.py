@@ -0,0 +1,161 @@
+# Rabin-Karp Rolling-Hash Substring Search
+#
+# Hash.md hashes whole keys with hash(key) % self.size. A rolling (polynomial)
+# hash goes one step further: after one O(n) pass that stores prefix hashes and
+# powers of the base, the hash of ANY substring text[i:j] is O(1) arithmetic,
+# with no slicing. That gives O(1) substring-equality checks and lets us look
+# for many equal-length patterns in a single linear scan instead of running
+# `pattern in text` once per pattern.
+#
+# Two independent moduli are used together ("double hashing"), so an accidental
+# collision needs both 30-bit hashes to collide at once. A random base per
+# instance keeps adversarial inputs from being precomputed against us.
+
+import random
+from array import array
+
+MOD_1 = 1_000_000_007
+MOD_2 = 998_244_353
+
+# 1. Turning Text into Integer Codes
+def _codes(text):
+    """
+    Returns an iterable of integer codes without copying the text. bytes-like
+    input goes through a memoryview (each item is already an int); str goes
+    through ord().
+    """
+    if isinstance(text, str):
+        return map(ord, text)
+    view = memoryview(text)
+    return view.cast("B") if view.ndim != 1 or view.format != "B" else view
+
+# 2. The Rolling Hash
+class RollingHash:
+    """
+    Prefix hashes and base powers for one text, under two moduli.
+    """
+    def __init__(self, text, base=None):
+        self.text = text
+        self.base = base or random.randrange(256, MOD_2 - 1)
+        n = len(text) if isinstance(text, str) else memoryview(text).nbytes
+        self.n = n
+        b = self.base
+        # 'q' arrays hold values < 2**31 as unboxed 8-byte ints instead of list slots.
+        self.prefix_1 = array("q", bytes(8 * (n + 1)))
+        self.prefix_2 = array("q", bytes(8 * (n + 1)))
+        self.power_1 = array("q", bytes(8 * (n + 1)))
+        self.power_2 = array("q", bytes(8 * (n + 1)))
+        self.power_1[0] = self.power_2[0] = 1
+        h1 = h2 = 0
+        p1 = p2 = 1
+        for i, code in enumerate(_codes(text), 1):
+            h1 = (h1 * b + code + 1) % MOD_1
+            h2 = (h2 * b + code + 1) % MOD_2
+            p1 = p1 * b % MOD_1
+            p2 = p2 * b % MOD_2
+            self.prefix_1[i] = h1
+            self.prefix_2[i] = h2
+            self.power_1[i] = p1
+            self.power_2[i] = p2
+
+    def __len__(self):
+        return self.n
+
+    def fingerprint(self, start, stop):
+        """
+        Returns the (h1, h2) fingerprint of text[start:stop] in O(1).
+        """
+        length = stop - start
+        h1 = (self.prefix_1[stop] - self.prefix_1[start] * self.power_1[length]) % MOD_1
+        h2 = (self.prefix_2[stop] - self.prefix_2[start] * self.power_2[length]) % MOD_2
+        return h1, h2
+
+    def key(self, start, stop):
+        """
+        Same as fingerprint, packed into one int - cheaper as a dict key.
+        """
+        h1, h2 = self.fingerprint(start, stop)
+        return h1 << 32 | h2
+
+    def substring_equal(self, i, j, length):
+        """
+        True if text[i:i+length] == text[j:j+length] (up to a double collision).
+        """
+        return self.fingerprint(i, i + length) == self.fingerprint(j, j + length)
+
+    def hash_of(self, pattern):
+        """
+        Fingerprint of an outside string/bytes under this instance's base, so it
+        can be compared against fingerprint() results.
+        """
+        b = self.base
+        h1 = h2 = 0
+        for code in _codes(pattern):
+            h1 = (h1 * b + code + 1) % MOD_1
+            h2 = (h2 * b + code + 1) % MOD_2
+        return h1, h2
+
+    # 3. Searching
+    def _matches_at(self, pattern, i):
+        # Exact check without building a slice: str.startswith takes an offset,
+        # and memoryview slices are views, not copies. Buffers are compared as
+        # bytes, the same units the hashes were built from.
+        if isinstance(self.text, str):
+            return self.text.startswith(pattern, i)
+        return _codes(self.text)[i:i + len(pattern)] == pattern
+
+    def find_all(self, patterns, verify=True):
+        """
+        Finds every occurrence of every pattern in one linear pass. All patterns
+        must share a length. Returns {pattern: [start indices]}; bytes-like
+        patterns (bytearray, memoryview, array) are keyed by bytes(pattern).
+
+        With verify=True each hash hit is confirmed exactly, so the result is
+        correct even in the (astronomically unlikely) event of a collision.
+        """
+        patterns = list(dict.fromkeys(p if isinstance(p, str) else bytes(p) for p in patterns))
+        results = {pattern: [] for pattern in patterns}
+        if not patterns:
+            return results
+        length = len(patterns[0])
+        if any(len(p) != length for p in patterns):
+            raise ValueError("find_all needs patterns of equal length")
+        if length == 0 or length > self.n:
+            return results
+
+        wanted = {}
+        for pattern in patterns:
+            h1, h2 = self.hash_of(pattern)
+            wanted.setdefault(h1 << 32 | h2, []).append(pattern)
+
+        prefix_1, prefix_2 = self.prefix_1, self.prefix_2
+        shift_1, shift_2 = self.power_1[length], self.power_2[length]
+        for start in range(self.n - length + 1):
+            stop = start + length
+            h1 = (prefix_1[stop] - prefix_1[start] * shift_1) % MOD_1
+            h2 = (prefix_2[stop] - prefix_2[start] * shift_2) % MOD_2
+            candidates = wanted.get(h1 << 32 | h2)
+            if candidates is None:
+                continue
+            for pattern in candidates:
+                if not verify or self._matches_at(pattern, start):
+                    results[pattern].append(start)
+        return results
+
+    def find(self, pattern, verify=True):
+        return self.find_all([pattern], verify).popitem()[1]
+
+def find_all(text, patterns, verify=True):
+    """
+    One-shot helper: build the rolling hash for text and search it.
+    """
+    return RollingHash(text).find_all(patterns, verify)
+
+if __name__ == "__main__":
+    text = "the quick brown fox jumps over the lazy dog; the end"
+    rh = RollingHash(text)
+    print("Occurrences:", rh.find_all(["the", "fox", "dog", "cat"]))
+    print("text[0:3] == text[31:34]:", rh.substring_equal(0, 31, 3))
+
+    blob = bytearray(b"GATTACA" * 100_000)
+    print("Byte hits:", {k: len(v) for k, v in find_all(blob, [b"TTA", b"ACA", b"CCC"]).items()})
@@ -0,0 +1,203 @@
+# Stable Hashing and a Consistent-Hash Ring for Sharding MyHashTable
+#
+# MyHashTable in Hash.md places keys with hash(key) % self.size. Python salts
+# hash() for str and bytes per process, so two workers put the same key in
+# different buckets. And even with a stable hash, "% n" reshuffles nearly every
+# key when n changes, so adding a machine would mean moving the whole table.
+#
+#   - stable_hash(): a seedable 64-bit hash of the key's bytes, identical in
+#     every process and on every machine. It is keyed BLAKE2b - a keyed hash in
+#     the same spirit as SipHash, with a C implementation in hashlib - so no
+#     third-party package is needed and the value never depends on what happens
+#     to be installed.
+#   - HashRing: each shard owns `vnodes` points on a 64-bit ring, and a key
+#     belongs to the first point clockwise from its hash. Adding shard N+1 only
+#     takes over the arcs in front of its own points: about 1/(N+1) of the keys.
+#   - ShardedHashTable: MyHashTable's insert/get/delete over several
+#     StableHashTable shards, with add_shard/remove_shard moving only the keys
+#     whose owner changed.
+
+import hashlib
+from bisect import bisect_right
+from collections import Counter
+
+from probabilistic_filters import key_bytes
+
+# 1. Stable Hashing
+def stable_hash(key, seed=0):
+    """
+    64-bit hash of key that is the same in every process. Different seeds give
+    independent hash functions.
+    """
+    digest = hashlib.blake2b(key_bytes(key), digest_size=8,
+                             key=seed.to_bytes(8, "little")).digest()
+    return int.from_bytes(digest, "little")
+
+class StableHashTable:
+    """
+    MyHashTable from Hash.md with _hash swapped for stable_hash, so bucket
+    placement agrees across processes.
+    """
+    def __init__(self, size=100, seed=0):
+        self.size = size
+        self.seed = seed
+        self.buckets = [[] for _ in range(size)]
+
+    def _hash(self, key):
+        return stable_hash(key, self.seed) % self.size
+
+    def insert(self, key, value):
+        index = self._hash(key)
+        for i, (k, v) in enumerate(self.buckets[index]):
+            if k == key:
+                self.buckets[index][i] = (key, value)
+                return
+        self.buckets[index].append((key, value))
+
+    def get(self, key):
+        index = self._hash(key)
+        for k, v in self.buckets[index]:
+            if k == key:
+                return v
+        raise KeyError(f'Key {key} not found')
+
+    def delete(self, key):
+        index = self._hash(key)
+        for i, (k, v) in enumerate(self.buckets[index]):
+            if k == key:
+                del self.buckets[index][i]
+                return
+        raise KeyError(f'Key {key} not found')
+
+    def items(self):
+        for bucket in self.buckets:
+            yield from bucket
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets)
+
+# 2. The Ring
+class HashRing:
+    """
+    Consistent hashing with virtual nodes. Shard names may be any key_bytes()
+    value (str, int, bytes).
+    """
+    def __init__(self, shards=(), vnodes=128, seed=0):
+        self.vnodes = vnodes
+        self.seed = seed
+        self._points = []   # sorted ring positions
+        self._owners = []   # shard owning each position
+        self.shards = set()
+        for shard in shards:
+            self.add(shard)
+
+    def _shard_points(self, shard):
+        return [stable_hash(f"{shard!r}#{i}", self.seed) for i in range(self.vnodes)]
+
+    def add(self, shard):
+        if shard in self.shards:
+            raise ValueError(f"shard {shard!r} is already on the ring")
+        self.shards.add(shard)
+        pairs = list(zip(self._points, self._owners))
+        pairs.extend((point, shard) for point in self._shard_points(shard))
+        pairs.sort()
+        self._points = [p for p, _ in pairs]
+        self._owners = [o for _, o in pairs]
+
+    def remove(self, shard):
+        if shard not in self.shards:
+            raise KeyError(f"shard {shard!r} is not on the ring")
+        self.shards.remove(shard)
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != shard]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def shard_for(self, key):
+        if not self._points:
+            raise LookupError("the ring has no shards")
+        # Ring positions of keys use seed + 1 so they are independent of the
+        # vnode positions.
+        i = bisect_right(self._points, stable_hash(key, self.seed + 1))
+        return self._owners[i % len(self._points)]
+
+    def distribution(self, keys):
+        """
+        {shard: number of keys} for a sample of keys.
+        """
+        counts = Counter(self.shard_for(key) for key in keys)
+        return {shard: counts.get(shard, 0) for shard in self.shards}
+
+# 3. Sharded Table
+class ShardedHashTable:
+    """
+    A MyHashTable split across shards by a HashRing. Each shard is a
+    StableHashTable here; in a real deployment it would live in its own process
+    or on its own machine, and only the ring needs to be shared.
+    """
+    def __init__(self, shards, size=100, vnodes=128, seed=0):
+        self.size = size
+        self.seed = seed
+        self.ring = HashRing(shards, vnodes, seed)
+        self.tables = {shard: StableHashTable(size, seed) for shard in self.ring.shards}
+
+    def _table(self, key):
+        return self.tables[self.ring.shard_for(key)]
+
+    def insert(self, key, value):
+        self._table(key).insert(key, value)
+
+    def get(self, key):
+        return self._table(key).get(key)
+
+    def delete(self, key):
+        self._table(key).delete(key)
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables.values())
+
+    def _rehome(self, sources):
+        moved = 0
+        for shard in sources:
+            table = self.tables[shard]
+            leaving = [(k, v) for k, v in table.items() if self.ring.shard_for(k) != shard]
+            for key, value in leaving:
+                table.delete(key)
+                self._table(key).insert(key, value)
+            moved += len(leaving)
+        return moved
+
+    def add_shard(self, shard):
+        """
+        Adds a shard and moves over only the keys it now owns. Returns how many moved.
+        """
+        self.ring.add(shard)
+        self.tables[shard] = StableHashTable(self.size, self.seed)
+        return self._rehome([s for s in self.tables if s != shard])
+
+    def remove_shard(self, shard):
+        """
+        Removes a shard, handing its keys to their new owners. Returns how many moved.
+        """
+        self.ring.remove(shard)
+        table = self.tables.pop(shard)
+        items = list(table.items())
+        for key, value in items:
+            self._table(key).insert(key, value)
+        return len(items)
+
+if __name__ == "__main__":
+    print("stable_hash('apple'):", stable_hash("apple"), "(the same in every process)")
+
+    table = ShardedHashTable([f"shard-{i}" for i in range(4)])
+    keys = [f"user:{i}" for i in range(20_000)]
+    for i, key in enumerate(keys):
+        table.insert(key, i)
+    print("Keys per shard:", {s: len(t) for s, t in sorted(table.tables.items())})
+
+    moved = table.add_shard("shard-4")
+    print(f"Adding a 5th shard moved {moved} of {len(keys)} keys "
+          f"({moved / len(keys):.1%}; ideal {1 / 5:.1%})")
+    print("Lookup after rebalance:", table.get("user:1234"))
+
+    naive_moved = sum(stable_hash(k) % 4 != stable_hash(k) % 5 for k in keys)
+    print(f"hash % n would have moved {naive_moved / len(keys):.1%}")
@@ -0,0 +1,165 @@
+# Parallel Map-Reduce Word Counting
+#
+# module_7 in python_tour.py counts six words with Counter(words). The same idea
+# scales to tens of GB of text if we stop reading the whole file into one list:
+#
+#   1. Map: split the file into byte ranges whose edges sit on line boundaries,
+#      and let each worker process count tokens in its own range, reading raw
+#      bytes in blocks (no decoding, no per-line Python objects).
+#   2. Reduce: merge the per-worker Counters pairwise in rounds (a tree), so
+#      the merge work is spread over the pool instead of one long serial fold.
+#
+# Counting happens on bytes tokens; they are decoded once, at the very end.
+
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+BLOCK_SIZE = 8 * 1024 * 1024
+
+WORD_RE = re.compile(rb"[A-Za-z0-9_']+")
+
+# 1. Splitting a File into Line-Aligned Ranges
+def line_aligned_ranges(path, parts):
+    """
+    Returns [(start, stop), ...] byte ranges covering the file, each ending just
+    after a newline (except possibly the last), so no line is split in two.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    parts = max(1, min(parts, size))
+    edges = [0]
+    with open(path, "rb") as file:
+        for i in range(1, parts):
+            target = max(size * i // parts, edges[-1])
+            file.seek(target)
+            file.readline()  # skip to the end of the line we landed in
+            edge = file.tell()
+            if edge >= size:
+                break
+            if edge > edges[-1]:
+                edges.append(edge)
+    edges.append(size)
+    return list(zip(edges, edges[1:]))
+
+# 2. Tokenizers
+def tokenize_split(block):
+    """
+    Fastest: whitespace split, lowercased. Punctuation stays attached.
+    """
+    return block.lower().split()
+
+def tokenize_words(block):
+    """
+    Regex words of letters, digits, underscores and apostrophes, lowercased.
+    """
+    return WORD_RE.findall(block.lower())
+
+TOKENIZERS = {"split": tokenize_split, "words": tokenize_words}
+
+# 3. Map: Counting One Range
+def count_range(path, start, stop, tokenizer="words", top_n=None):
+    tokenize = TOKENIZERS[tokenizer]
+    counts = Counter()
+    carry = b""
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = file.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            block = carry + block
+            # Hold back a trailing partial token for the next block.
+            cut = max(block.rfind(b"\n"), block.rfind(b" "))
+            if remaining > 0 and cut != -1:
+                block, carry = block[:cut + 1], block[cut + 1:]
+            else:
+                carry = b""
+            counts.update(tokenize(block))
+        if carry:
+            counts.update(tokenize(carry))
+    if top_n is not None:
+        counts = Counter(dict(counts.most_common(top_n)))
+    return counts
+
+def _count_job(job):
+    return count_range(*job)
+
+# 4. Reduce: Tree Merge
+def _merge_pair(pair):
+    left, right = pair
+    if right is not None:
+        left.update(right)
+    return left
+
+def tree_merge(counters, pool=None, top_n=None):
+    """
+    Merges Counters pairwise in rounds: n -> n/2 -> ... -> 1.
+    """
+    counters = list(counters)
+    if not counters:
+        return Counter()
+    mapper = pool.map if pool is not None else map
+    while len(counters) > 1:
+        pairs = [(counters[i], counters[i + 1] if i + 1 < len(counters) else None)
+                 for i in range(0, len(counters), 2)]
+        counters = list(mapper(_merge_pair, pairs))
+        if top_n is not None:
+            counters = [Counter(dict(c.most_common(top_n))) for c in counters]
+    return counters[0]
+
+# 5. Putting it Together
+def count_words(path, workers=None, tokenizer="words", top_n=None, parts_per_worker=4):
+    """
+    Counts tokens in a file across a process pool. Returns a Counter of str.
+
+    top_n bounds memory by keeping only the N most common tokens per chunk and
+    per merge. That makes the result approximate: a token that is common overall
+    but never in any chunk's top N is dropped. Keep N well above what you report.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = line_aligned_ranges(path, workers * parts_per_worker)
+    jobs = [(path, start, stop, tokenizer, top_n) for start, stop in ranges]
+    if workers == 1:
+        counts = tree_merge(map(_count_job, jobs), top_n=top_n)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_count_job, jobs))
+            counts = tree_merge(partials, pool, top_n)
+    result = Counter()
+    for token, n in counts.items():
+        # Add, not assign: different invalid byte tokens decode to the same str.
+        result[token.decode("utf-8", "replace")] += n
+    return result
+
+def scaling(path, worker_counts=(1, 2, 4, 8), **kwargs):
+    """
+    Returns [(workers, MB/s)] for each worker count.
+    """
+    size_mb = os.path.getsize(path) / 1e6
+    results = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        count_words(path, workers=workers, **kwargs)
+        results.append((workers, size_mb / (time.perf_counter() - start)))
+    return results
+
+if __name__ == "__main__":
+    import tempfile
+
+    words = ["apple", "banana", "apple", "orange", "banana", "apple"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words.txt")
+        with open(path, "w") as file:
+            for i in range(200_000):
+                file.write(" ".join(words) + f" line{i % 100}\n")
+
+        counts = count_words(path)
+        print("Most common words:", counts.most_common(3))
+        for workers, rate in scaling(path, worker_counts=(1, 2, 4)):
+            print(f"{workers} workers: {rate:6.1f} MB/s")